@@ -1,22 +1,54 @@
 """
 Mini Expense Tracker - Python client
-Run after executing init.sql.
-Requires: mysql-connector-python
+Run after executing init.sql (MySQL), or set DB_BACKEND=sqlite to use an
+embedded database file (SQLITE_PATH) that is created on first use.
+Requires: mysql-connector-python (MySQL backend only)
+
+Usage:
+  python Mini-Expense-Tracker.py                        # show reports
+  python Mini-Expense-Tracker.py --stats - COMMAND ...  # print query timings afterwards
+  python Mini-Expense-Tracker.py import FILE.csv [--batch-size N] [--on-error skip|abort]
+  python Mini-Expense-Tracker.py ingest FOLDER [--pattern *.csv] [--workers N]
+  python Mini-Expense-Tracker.py rollup rebuild|verify  # monthly rollup maintenance
+  python Mini-Expense-Tracker.py range 2025-01-01 2025-03-31
+  python Mini-Expense-Tracker.py explain [--month YYYY-MM]
+  python Mini-Expense-Tracker.py export out.csv|out.jsonl|- [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+  python Mini-Expense-Tracker.py cache stats|clear       # needs REPORT_CACHE_PATH to persist
 """
 
 import os
+import sys
 import csv
+import json
+import time
+import glob
 import getpass
-from datetime import date
-from typing import List, Dict, Optional
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional
 
-import mysql.connector
-from mysql.connector import Error
+from expense_backends import Backend, MySQLBackend, SQLiteBackend
+from expense_cache import ReportCache
+from expense_ingest import RowHasher, parse_csv_row, parse_statement
+from expense_stats import QueryStats
 
 # ---- Configure via env vars or edit here ----
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql")               # mysql | sqlite
+SQLITE_PATH = os.getenv("SQLITE_PATH", "mini_expense.sqlite3")
 DB_HOST = os.getenv("DB_HOST", "127.0.0.1")
 DB_USER = os.getenv("DB_USER", "root")
 DB_NAME = os.getenv("DB_NAME", "mini_expense")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))          # connections kept open
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a free one
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "128"))  # cached report results (LRU)
+REPORT_CACHE_PATH = os.getenv("REPORT_CACHE_PATH")            # optional on-disk copy of the cache
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))       # slow-query log threshold
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG")                   # slow-query log file (default: stderr)
+
+# Per-statement timings for everything below; dump with --stats or query_stats.dump()
+query_stats = QueryStats(slow_ms=SLOW_QUERY_MS, slow_log=SLOW_QUERY_LOG)
 
 # Global variable to store the password once entered
 _db_password = None
@@ -30,24 +62,102 @@ def get_db_password():
         _db_password = getpass.getpass(f"Enter password for MySQL user '{DB_USER}': ")
     return _db_password
 
+# ---- Backend / sessions ----
+_backend = None
+
+def get_backend() -> Backend:
+    """The storage backend picked by DB_BACKEND, created on first use."""
+    global _backend
+    if _backend is None:
+        if DB_BACKEND == "sqlite":
+            _backend = SQLiteBackend(SQLITE_PATH)
+        elif DB_BACKEND == "mysql":
+            _backend = MySQLBackend(DB_HOST, DB_USER, DB_NAME, password=get_db_password,
+                                    pool_size=DB_POOL_SIZE, pool_timeout=DB_POOL_TIMEOUT)
+        else:
+            raise ValueError(f"Unknown DB_BACKEND {DB_BACKEND!r} (expected mysql or sqlite)")
+    return _backend
+
+def set_backend(backend: Backend) -> None:
+    """Swap the active backend (benchmarks, scripts, an offline SQLite file)."""
+    global _backend
+    if _backend is not None and _backend is not backend:
+        _backend.close()
+    _backend = backend
+
 def get_conn():
-    return mysql.connector.connect(
-        host=DB_HOST, 
-        user=DB_USER, 
-        password=get_db_password(), 
-        database=DB_NAME
-    )
+    """
+    Borrow a connection from the active backend; give it back with
+    release_conn(). MySQL connections come from a shared pool that
+    revalidates them on checkout.
+    """
+    started = time.perf_counter()
+    conn = get_backend().connect()
+    query_stats.record_connect(time.perf_counter() - started)
+    return conn
 
-# ---- Core DB helpers ----
-def insert_expense(occurred_on: str, amount: float, category: str, note: Optional[str] = None) -> None:
-    sql = """
-      INSERT INTO expenses (occurred_on, amount, category, note)
-      VALUES (%s, %s, %s, %s)
-    """
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql, (occurred_on, amount, category, note))
+def release_conn(conn) -> None:
+    get_backend().release(conn)
+
+def _timed_execute(cur, sql: str, params: Optional[tuple]) -> float:
+    started = time.perf_counter()
+    cur.execute(*get_backend().prepare(sql, params))
+    return time.perf_counter() - started
+
+def execute(cur, sql: str, params: Optional[tuple] = None) -> None:
+    """
+    Run a %s-style statement that returns no rows on cur, translated for
+    the active backend and recorded in query_stats.
+    """
+    query_stats.record(sql, _timed_execute(cur, sql, params), rows=cur.rowcount)
+
+def executemany(cur, sql: str, rows: List[tuple]) -> None:
+    started = time.perf_counter()
+    cur.executemany(*get_backend().prepare_many(sql, rows))
+    query_stats.record(sql, time.perf_counter() - started, rows=cur.rowcount)
+
+@contextmanager
+def session():
+    """
+    One pooled connection and one transaction for a group of operations:
+
+        with session() as conn:
+            insert_expense(..., conn=conn)
+            rows = fetch_all(..., conn=conn)
+
+    Commits on success, rolls back on any exception.
+    """
+    conn = get_conn()
+    try:
+        yield conn
         conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        release_conn(conn)
+
+# ---- Core DB helpers ----
+INSERT_EXPENSE_SQL = """
+  INSERT INTO expenses (occurred_on, amount, category, note)
+  VALUES (%s, %s, %s, %s)
+"""
+
+def insert_hashed_sql(backend: Backend) -> str:
+    """INSERT for (occurred_on, amount, category, note, txn_hash) rows that skips stored hashes."""
+    return f"""
+      {backend.insert_ignore()} INTO expenses (occurred_on, amount, category, note, txn_hash)
+      VALUES (%s, %s, %s, %s, %s)
+    """
+
+def insert_expense(occurred_on: str, amount: float, category: str, note: Optional[str] = None,
+                   conn=None) -> None:
+    """Insert one row. Pass conn from session() to join its transaction."""
+    if conn is None:
+        with session() as conn:
+            return insert_expense(occurred_on, amount, category, note, conn=conn)
+    with get_backend().cursor(conn) as cur:
+        execute(cur, INSERT_EXPENSE_SQL, (occurred_on, amount, category, note))
 
 def import_csv(csv_path: str) -> int:
     """
@@ -55,33 +165,387 @@ def import_csv(csv_path: str) -> int:
     amount: negative = expense, positive = income
     """
     count = 0
-    with open(csv_path, newline="", encoding="utf-8") as f:
+    with open(csv_path, newline="", encoding="utf-8") as f, session() as conn:
         reader = csv.DictReader(f)
         for r in reader:
             occurred_on = (r.get("date") or r.get("Date")).strip()
             amount = float(r.get("amount") or r.get("Amount"))
             category = (r.get("category") or r.get("Category") or "Uncategorized").strip()
             note = (r.get("note") or r.get("Note") or "").strip() or None
-            insert_expense(occurred_on, amount, category, note)
+            insert_expense(occurred_on, amount, category, note, conn=conn)
             count += 1
     return count
 
-def fetch_all(sql: str, params: Optional[tuple] = None) -> List[Dict]:
-    with get_conn() as conn:
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(sql, params or ())
-            return cur.fetchall()
+def import_csv_bulk(csv_path: str, batch_size: int = 1000, on_error: str = "skip") -> int:
+    """
+    Stream a CSV into expenses in batches, one transaction per batch.
+    Same columns as import_csv. Rows are sent with executemany, which
+    mysql-connector rewrites into a single multi-row INSERT (SQLite reuses
+    one prepared statement). Rows get the same txn_hash as ingest_directory
+    gives them, and rows already stored (by either command) are ignored,
+    so importing a file twice adds it once.
+
+    on_error="skip"  -> bad rows are reported and left out, import continues
+    on_error="abort" -> the batch holding the bad row is rolled back and the
+                        import stops (batches already committed are kept)
+    Returns the number of rows inserted.
+    """
+    if on_error not in ("skip", "abort"):
+        raise ValueError("on_error must be 'skip' or 'abort'")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    inserted = duplicates = skipped = 0
+    started = time.perf_counter()
+    backend = get_backend()
+    sql = insert_hashed_sql(backend)
+    with_hash = RowHasher()
+    conn = get_conn()
+    try:
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            batch = []
+            with backend.cursor(conn) as cur:
+                def flush():
+                    nonlocal inserted, duplicates
+                    if not batch:
+                        return
+                    try:
+                        backend.begin(conn)
+                        executemany(cur, sql, batch)
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                    inserted += cur.rowcount
+                    duplicates += len(batch) - cur.rowcount
+                    batch.clear()
+
+                for r in reader:
+                    try:
+                        batch.append(with_hash(parse_csv_row(r)))
+                    except (ValueError, TypeError) as e:
+                        if on_error == "abort":
+                            raise ValueError(
+                                f"{csv_path}:{reader.line_num}: {e} "
+                                f"(batch of {len(batch)} rows discarded, {inserted} rows already committed)"
+                            ) from e
+                        skipped += 1
+                        print(f"Skipping {csv_path}:{reader.line_num}: {e}", file=sys.stderr)
+                        continue
+                    if len(batch) >= batch_size:
+                        flush()
+                flush()
+    finally:
+        release_conn(conn)
+
+    elapsed = time.perf_counter() - started
+    rate = (inserted + duplicates) / elapsed if elapsed > 0 else float("inf")
+    print(f"Imported {inserted} rows ({duplicates} already loaded, {skipped} skipped) "
+          f"in {elapsed:.2f}s - {rate:,.0f} rows/sec")
+    return inserted
+
+def ingest_directory(folder: str, pattern: str = "*.csv", workers: Optional[int] = None,
+                     batch_size: int = 1000) -> tuple:
+    """
+    Load every statement file in folder matching pattern. Files are parsed
+    and hashed in a process pool; this process writes the rows in batches
+    as each file finishes. Rows whose txn_hash is already stored are
+    ignored, so re-running an ingest over the same folder adds nothing.
+    Returns (inserted, duplicates, skipped).
+    """
+    paths = sorted(glob.glob(os.path.join(folder, pattern)))
+    if not paths:
+        print(f"No files matching {pattern} in {folder}")
+        return 0, 0, 0
+
+    backend = get_backend()
+    sql = insert_hashed_sql(backend)
+    inserted = duplicates = skipped = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(parse_statement, p) for p in paths]
+        conn = get_conn()
+        try:
+            with backend.cursor(conn) as cur:
+                for fut in as_completed(futures):
+                    path, rows, errors = fut.result()
+                    for line, msg in errors:
+                        print(f"Skipping {path}:{line}: {msg}", file=sys.stderr)
+                    file_inserted = 0
+                    for i in range(0, len(rows), batch_size):
+                        batch = rows[i:i + batch_size]
+                        try:
+                            backend.begin(conn)
+                            executemany(cur, sql, batch)
+                            conn.commit()
+                        except Exception:
+                            conn.rollback()
+                            raise
+                        file_inserted += cur.rowcount
+                    inserted += file_inserted
+                    duplicates += len(rows) - file_inserted
+                    skipped += len(errors)
+                    print(f"{os.path.basename(path)}: {file_inserted} new, "
+                          f"{len(rows) - file_inserted} already loaded, {len(errors)} skipped")
+        finally:
+            release_conn(conn)
+
+    elapsed = time.perf_counter() - started
+    total = inserted + duplicates
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    print(f"Ingested {len(paths)} files: {inserted} new rows, {duplicates} duplicates, "
+          f"{skipped} skipped in {elapsed:.2f}s - {rate:,.0f} rows/sec")
+    return inserted, duplicates, skipped
+
+def fetch_all(sql: str, params: Optional[tuple] = None, conn=None) -> List[Dict]:
+    if conn is None:
+        with session() as conn:
+            return fetch_all(sql, params, conn=conn)
+    with get_backend().cursor(conn, dictionary=True) as cur:
+        execute_s = _timed_execute(cur, sql, params)
+        started = time.perf_counter()
+        rows = cur.fetchall()
+        query_stats.record(sql, execute_s, time.perf_counter() - started, len(rows))
+        return rows
+
+def iter_rows(sql: str, params: Optional[tuple] = None, chunk_size: int = 10_000,
+              conn=None) -> Iterator[Dict]:
+    """
+    Like fetch_all, but yields rows as they arrive. Uses an unbuffered
+    (streaming) cursor so the server sends the result incrementally and only
+    chunk_size rows are held client-side at a time. The connection is busy
+    until the generator is exhausted or closed.
+    """
+    if conn is None:
+        with session() as conn:
+            yield from iter_rows(sql, params, chunk_size, conn=conn)
+        return
+    with get_backend().cursor(conn, dictionary=True, stream=True) as cur:
+        execute_s = _timed_execute(cur, sql, params)
+        fetch_s = 0.0
+        count = 0
+        try:
+            while True:
+                started = time.perf_counter()
+                rows = cur.fetchmany(chunk_size)
+                fetch_s += time.perf_counter() - started
+                if not rows:
+                    break
+                count += len(rows)
+                yield from rows
+        finally:
+            query_stats.record(sql, execute_s, fetch_s, count)
+
+# ---- Export ----
+EXPORT_COLUMNS = ("expense_id", "occurred_on", "amount", "category", "note", "created_at")
+
+def export_expenses(out_path: str, start: Optional[date] = None, end: Optional[date] = None,
+                    fmt: str = "csv", chunk_size: int = 10_000) -> int:
+    """
+    Stream expenses with start <= occurred_on < end (either bound optional)
+    to CSV or JSON Lines. out_path "-" writes to stdout. Memory use stays
+    flat regardless of how many rows are exported. Returns the row count.
+    """
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError("fmt must be 'csv' or 'jsonl'")
+    clauses, params = [], ()
+    if start is not None:
+        clauses.append("occurred_on >= %s")
+        params += (start,)
+    if end is not None:
+        clauses.append("occurred_on < %s")
+        params += (end,)
+    sql = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM expenses"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY occurred_on, expense_id"
+
+    out = sys.stdout if out_path == "-" else open(out_path, "w", newline="", encoding="utf-8")
+    count = 0
+    try:
+        if fmt == "csv":
+            writer = csv.writer(out)
+            writer.writerow(EXPORT_COLUMNS)
+            for r in iter_rows(sql, params, chunk_size):
+                r["amount"] = f"{r['amount']:.2f}"
+                writer.writerow([r[c] for c in EXPORT_COLUMNS])
+                count += 1
+        else:
+            for r in iter_rows(sql, params, chunk_size):
+                r["amount"] = round(float(r["amount"]), 2)
+                out.write(json.dumps(r, default=str) + "\n")
+                count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return count
+
+# ---- Monthly rollup (see monthly_category_totals in init.sql) ----
+def rebuild_rollup_sql(backend: Backend) -> str:
+    month = backend.month_start("occurred_on")
+    return f"""
+      INSERT INTO monthly_category_totals (month_start, category, total_amount, txn_count)
+      SELECT {month}, category, ROUND(SUM(amount), 2), COUNT(*)
+      FROM expenses
+      GROUP BY {month}, category
+    """
+
+def verify_rollup_sql(backend: Backend) -> List[str]:
+    """
+    Two queries: raw (month, category) groups that are missing from the
+    rollup or disagree with it, and rollup rows with no expenses behind them.
+    """
+    return [f"""
+      SELECT raw.month_start, raw.category,
+             raw.total_amount AS expected_total, raw.txn_count AS expected_count,
+             r.total_amount AS rollup_total, r.txn_count AS rollup_count
+      FROM (
+        SELECT {backend.month_start("occurred_on")} AS month_start, category,
+               ROUND(SUM(amount), 2) AS total_amount, COUNT(*) AS txn_count
+        FROM expenses
+        GROUP BY 1, 2
+      ) raw
+      LEFT JOIN monthly_category_totals r
+        ON r.month_start = raw.month_start AND r.category = raw.category
+      WHERE r.month_start IS NULL
+         OR ROUND(r.total_amount, 2) <> raw.total_amount
+         OR r.txn_count <> raw.txn_count
+    """, f"""
+      SELECT r.month_start, r.category,
+             0 AS expected_total, 0 AS expected_count,
+             r.total_amount AS rollup_total, r.txn_count AS rollup_count
+      FROM monthly_category_totals r
+      WHERE NOT EXISTS (
+        SELECT 1 FROM expenses e
+        WHERE e.occurred_on >= r.month_start
+          AND e.occurred_on < {backend.next_month("r.month_start")}
+          AND e.category = r.category
+      )
+    """]
+
+def rebuild_rollups() -> int:
+    """Recompute monthly_category_totals from expenses in one transaction."""
+    backend = get_backend()
+    with session() as conn:
+        with backend.cursor(conn) as cur:
+            execute(cur, "DELETE FROM monthly_category_totals")
+            execute(cur, rebuild_rollup_sql(backend))
+            groups = cur.rowcount
+            execute(cur, "UPDATE data_version SET version = version + 1 WHERE id = 1")
+            return groups
+
+def verify_rollups() -> List[Dict]:
+    """Return every rollup row that does not match the raw expenses table."""
+    with session() as conn:
+        return [row for sql in verify_rollup_sql(get_backend()) for row in fetch_all(sql, conn=conn)]
+
+# ---- Date-range query helpers ----
+# Reports filter on half-open ranges of the raw occurred_on column so the
+# database can range-scan idx_date_cat_amount instead of evaluating
+# DATE_FORMAT on every row.
+def month_bounds(month_yyyy_mm: str) -> tuple:
+    """'2025-09' -> (date(2025, 9, 1), date(2025, 10, 1))"""
+    start = datetime.strptime(month_yyyy_mm, "%Y-%m").date()
+    end = date(start.year + (start.month == 12), start.month % 12 + 1, 1)
+    return start, end
+
+def occurred_between(start: date, end: date) -> tuple:
+    """Sargable predicate for start <= occurred_on < end, as (sql, params)."""
+    return "occurred_on >= %s AND occurred_on < %s", (start, end)
+
+def category_totals_query(start: date, end: date) -> tuple:
+    where, params = occurred_between(start, end)
+    sql = f"""
+      SELECT category, ROUND(SUM(amount), 2) AS total_amount, COUNT(*) AS txn_count
+      FROM expenses
+      WHERE {where}
+      GROUP BY category
+      ORDER BY ABS(SUM(amount)) DESC
+    """
+    return sql, params
+
+def explain_report_queries(month_yyyy_mm: str = "2025-09") -> List[Dict]:
+    """
+    EXPLAIN the report queries and flag any table access that is not an
+    index lookup or range scan. Returns the offending plan rows.
+    """
+    start, end = month_bounds(month_yyyy_mm)
+    checks = [
+        ("category breakdown",
+         "SELECT category, total_amount, txn_count FROM monthly_category_totals WHERE month_start=%s",
+         (start,)),
+        ("category range", *category_totals_query(start, end)),
+    ]
+    backend = get_backend()
+    bad = []
+    with session() as conn:
+        for name, sql, params in checks:
+            for step in backend.explain(conn, sql, params):
+                print(f"{'ok ' if step['ok'] else 'BAD'} {name:<20} table={step['table']} "
+                      f"access={step['access']} index={step['index']} detail={step['detail']}")
+                if not step["ok"]:
+                    bad.append(dict(step, query=name))
+    return bad
+
+# ---- Report cache (see expense_cache.py) ----
+_report_cache = None
+
+def get_report_cache() -> ReportCache:
+    """The report cache for the active backend; loads the disk copy on first use."""
+    global _report_cache
+    owner = get_backend().dsn
+    if _report_cache is None or _report_cache.owner != owner:
+        _report_cache = ReportCache(REPORT_CACHE_SIZE, REPORT_CACHE_PATH, owner=owner)
+        _report_cache.load()
+    return _report_cache
+
+def data_watermark(conn) -> Optional[tuple]:
+    """
+    (epoch, version) from data_version; changes whenever expenses change.
+    None if the database has no data_version table (a MySQL database not
+    yet upgraded, see the end of init.sql) or its row is missing.
+    """
+    try:
+        row = fetch_all("SELECT epoch, version FROM data_version WHERE id = 1", conn=conn)
+    except get_backend().missing_table_errors():
+        return None
+    return (row[0]["epoch"], row[0]["version"]) if row else None
+
+def cached_rows(report: str, sql: str, params: Optional[tuple] = None) -> List[Dict]:
+    """
+    fetch_all for report queries. While the data watermark is unchanged the
+    cached rows are returned and the aggregate query is not run at all.
+    """
+    cache = get_report_cache()
+    with session() as conn:
+        watermark = data_watermark(conn)
+        if watermark is None:  # nothing to tell stale results by: never cache
+            return fetch_all(sql, params, conn=conn)
+        return cache.get_or_compute((report, params), watermark,
+                                    lambda: fetch_all(sql, params, conn=conn))
 
 # ---- Reports ----
 def report_monthly_totals() -> None:
-    rows = fetch_all("SELECT * FROM v_monthly_totals;")
+    rows = cached_rows("monthly_totals", """
+      SELECT month_start, ROUND(SUM(total_amount), 2) AS net_amount
+      FROM monthly_category_totals
+      GROUP BY month_start
+      ORDER BY month_start;
+    """)
     print("\n=== Monthly Net (income - expenses) ===")
     for r in rows:
         print(f"{r['month_start']}: {r['net_amount']:.2f}")
 
 def report_category_breakdown(month_yyyy_mm: str) -> None:
-    rows = fetch_all(
-        "SELECT category, total_amount, txn_count FROM v_monthly_category WHERE month_start=%s;",
+    rows = cached_rows(
+        "category_breakdown",
+        """
+        SELECT category, total_amount, txn_count
+        FROM monthly_category_totals
+        WHERE month_start=%s
+        ORDER BY ABS(total_amount) DESC;
+        """,
         (f"{month_yyyy_mm}-01",),
     )
     print(f"\n=== Category Breakdown for {month_yyyy_mm} ===")
@@ -91,6 +555,16 @@ def report_category_breakdown(month_yyyy_mm: str) -> None:
         amt = float(r["total_amount"])
         print(f"{r['category']:<16} {amt:>10.2f}  ({r['txn_count']} txns)")
 
+def report_category_range(start: date, end: date) -> None:
+    """Category breakdown for start <= occurred_on < end, straight from expenses."""
+    rows = cached_rows("category_range", *category_totals_query(start, end))
+    print(f"\n=== Category Breakdown for {start} to {end - timedelta(days=1)} ===")
+    if not rows:
+        print("No data.")
+    for r in rows:
+        amt = float(r["total_amount"])
+        print(f"{r['category']:<16} {amt:>10.2f}  ({r['txn_count']} txns)")
+
 # ---- Demo runner ----
 SAMPLE_CSV = """date,amount,category,note
 2025-09-10,-18.90,Dining,Coffee & bagel
@@ -103,8 +577,104 @@ def write_sample_csv(path="sample_expenses.csv") -> str:
         f.write(SAMPLE_CSV)
     return path
 
-def main():
-    print("Mini Expense Tracker (DB:", DB_NAME, ")")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mini Expense Tracker")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="dump query timings on exit to FILE (.json for JSON, - for stdout)")
+    sub = parser.add_subparsers(dest="command")
+
+    p_import = sub.add_parser("import", help="bulk import a CSV file")
+    p_import.add_argument("csv_path")
+    p_import.add_argument("--batch-size", type=int, default=1000,
+                          help="rows per INSERT/transaction (default: 1000)")
+    p_import.add_argument("--on-error", choices=["skip", "abort"], default="skip",
+                          help="skip and report bad rows, or abort the batch (default: skip)")
+
+    p_ingest = sub.add_parser("ingest", help="load every CSV statement in a folder, skipping rows already loaded")
+    p_ingest.add_argument("folder")
+    p_ingest.add_argument("--pattern", default="*.csv", help="file glob inside the folder (default: *.csv)")
+    p_ingest.add_argument("--workers", type=int, help="parser processes (default: CPU count)")
+    p_ingest.add_argument("--batch-size", type=int, default=1000, help="rows per INSERT/transaction")
+
+    p_rollup = sub.add_parser("rollup", help="maintain the monthly rollup table")
+    p_rollup.add_argument("action", choices=["rebuild", "verify"])
+
+    p_range = sub.add_parser("range", help="category breakdown for a date range")
+    p_range.add_argument("start", type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    p_range.add_argument("end", type=date.fromisoformat, help="last day (inclusive), YYYY-MM-DD")
+
+    p_explain = sub.add_parser("explain", help="check that report queries use index range scans")
+    p_explain.add_argument("--month", default="2025-09", help="YYYY-MM to plan for")
+
+    p_export = sub.add_parser("export", help="stream expenses to CSV or JSON Lines")
+    p_export.add_argument("out_path", help="output file, or - for stdout")
+    p_export.add_argument("--from", dest="start", type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    p_export.add_argument("--to", dest="end", type=date.fromisoformat, help="last day (inclusive), YYYY-MM-DD")
+    p_export.add_argument("--format", choices=["csv", "jsonl"],
+                          help="default: from the file extension, else csv")
+    p_export.add_argument("--chunk-size", type=int, default=10_000, help="rows fetched per round trip")
+
+    p_cache = sub.add_parser("cache", help="report cache statistics / clear the on-disk copy")
+    p_cache.add_argument("action", choices=["stats", "clear"])
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return run_command(args)
+    finally:
+        if args.stats:
+            query_stats.dump(args.stats)
+
+def run_command(args):
+    if args.command == "import":
+        try:
+            import_csv_bulk(args.csv_path, batch_size=args.batch_size, on_error=args.on_error)
+        except ValueError as e:
+            print(f"Import aborted: {e}", file=sys.stderr)
+            return 1
+        return 0
+    if args.command == "ingest":
+        ingest_directory(args.folder, args.pattern, workers=args.workers, batch_size=args.batch_size)
+        return 0
+    if args.command == "rollup":
+        if args.action == "rebuild":
+            groups = rebuild_rollups()
+            print(f"Rebuilt monthly rollup: {groups} (month, category) rows.")
+            return 0
+        mismatches = verify_rollups()
+        for m in mismatches:
+            print(f"MISMATCH {m['month_start']} {m['category']}: "
+                  f"expected {float(m['expected_total']):.2f} / {m['expected_count']} txns, "
+                  f"rollup has {m['rollup_total']} / {m['rollup_count']}")
+        print("Rollup OK." if not mismatches else f"{len(mismatches)} mismatched rollup rows; "
+              "run 'rollup rebuild' to fix.")
+        return 0 if not mismatches else 1
+    if args.command == "range":
+        report_category_range(args.start, args.end + timedelta(days=1))
+        get_report_cache().save()
+        return 0
+    if args.command == "explain":
+        return 1 if explain_report_queries(args.month) else 0
+    if args.command == "export":
+        fmt = args.format or ("jsonl" if args.out_path.endswith((".jsonl", ".ndjson")) else "csv")
+        end = args.end + timedelta(days=1) if args.end else None
+        count = export_expenses(args.out_path, args.start, end, fmt=fmt, chunk_size=args.chunk_size)
+        print(f"Exported {count} rows.", file=sys.stderr)
+        return 0
+
+    if args.command == "cache":
+        cache = get_report_cache()
+        if args.action == "clear":
+            cache.clear()
+            print("Report cache cleared.")
+        else:
+            for k, v in cache.stats().items():
+                print(f"{k:<14} {v:.2%}" if k == "hit_rate" else f"{k:<14} {v}")
+        return 0
+
+    db = SQLITE_PATH if DB_BACKEND == "sqlite" else DB_NAME
+    print("Mini Expense Tracker (DB:", db, ")")
     
     # Just display existing data - no automatic inserts
     print("Displaying current data from database...\n")
@@ -113,10 +683,15 @@ def main():
     report_monthly_totals()
     report_category_breakdown("2025-09")
 
+    get_report_cache().save()
     print("\nDone.")
     print("\nNote: To add data, you can:")
-    print("- Edit the database directly in MySQL Workbench")
-    print("- Uncomment the insert/import lines in the code if needed")
+    backend = get_backend()
+    if backend.name == "sqlite":
+        print(f"- Edit {backend.path} directly with the sqlite3 shell or a SQLite browser")
+    else:
+        print("- Edit the database directly in MySQL Workbench")
+    print("- Load a CSV statement with the 'import' or 'ingest' command")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Benchmark harness for the Mini Expense Tracker.
+
+Generates synthetic statements in the SAMPLE_CSV format (several years,
+skewed category mix, biweekly paychecks), loads them into a scratch
+database and times import throughput, single-row inserts, fetches,
+streaming and the reports. Results are written as JSON so two runs can be
+compared with --compare.
+
+  python bench_expenses.py                         # 10k rows on a temp SQLite file
+  python bench_expenses.py --sizes 10k,1m --memory --out results.json
+  python bench_expenses.py --sizes 1m --compare baseline.json
+
+By default every size runs against a fresh SQLite file. With
+--backend mysql the configured MySQL database (DB_* env vars) is used
+instead and its expenses table is EMPTIED first - point DB_NAME at a
+scratch database. The timing, results file and --compare come from
+bench_harness.py at the top of the repository.
+"""
+
+import argparse
+import csv
+import importlib.util
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import bench_harness  # noqa: E402
+
+
+def load_tracker():
+    """Import Mini-Expense-Tracker.py (its file name is not a valid module name)."""
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    spec = importlib.util.spec_from_file_location("mini_expense_tracker",
+                                                  os.path.join(HERE, "Mini-Expense-Tracker.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---- Synthetic data ----
+# (category, relative frequency, typical amount, spread); Income is added separately
+CATEGORIES = [
+    ("Groceries", 30, 65.0, 0.6),
+    ("Dining", 25, 22.0, 0.7),
+    ("Transportation", 15, 18.0, 0.8),
+    ("Shopping", 10, 55.0, 1.0),
+    ("Entertainment", 6, 35.0, 0.8),
+    ("Utilities", 4, 110.0, 0.3),
+    ("Health", 3, 80.0, 0.9),
+    ("Travel", 2, 420.0, 0.8),
+    ("Rent", 1, 1800.0, 0.05),
+]
+NOTES = {
+    "Groceries": ["WF run", "Trader Joe's", "Costco", "Corner store"],
+    "Dining": ["Coffee & bagel", "Burrito", "Lunch", "Dinner out", "Pizza"],
+    "Transportation": ["Metro card", "Gas", "Rideshare", "Parking"],
+    "Shopping": ["Amazon", "Clothes", "Hardware store"],
+    "Entertainment": ["Movies", "Concert", "Streaming"],
+    "Utilities": ["Electric", "Water", "Internet", "Phone"],
+    "Health": ["Pharmacy", "Copay", "Gym"],
+    "Travel": ["Flight", "Hotel", "Train"],
+    "Rent": ["Rent"],
+}
+
+
+def generate_rows(n: int, years: int = 3, seed: int = 42):
+    """Yield n (date, amount, category, note) rows in date order."""
+    rng = random.Random(seed)
+    names = [c[0] for c in CATEGORIES]
+    weights = [c[1] for c in CATEGORIES]
+    params = {c[0]: (c[2], c[3]) for c in CATEGORIES}
+    start = date(date.today().year - years + 1, 1, 1)
+    days = years * 365
+    per_day = n / days
+    emitted = 0
+    for d in range(days):
+        day = start + timedelta(days=d)
+        # every other Friday is payday
+        if day.weekday() == 4 and (d // 7) % 2 == 0 and emitted < n:
+            yield day.isoformat(), 2000.00, "Income", "Paycheck"
+            emitted += 1
+        # spread the remaining rows evenly over the days
+        target = min(n, round((d + 1) * per_day))
+        count = max(0, target - emitted)
+        for category in rng.choices(names, weights, k=count):
+            typical, spread = params[category]
+            amount = -round(typical * rng.lognormvariate(0, spread), 2)
+            yield day.isoformat(), amount, category, rng.choice(NOTES[category])
+        emitted += count
+    while emitted < n:  # rounding leftovers land on the last day
+        yield day.isoformat(), -5.00, "Dining", "Coffee & bagel"
+        emitted += 1
+
+
+def write_csv(path: str, n: int, years: int, seed: int) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["date", "amount", "category", "note"])
+        for d, amount, category, note in generate_rows(n, years, seed):
+            w.writerow([d, f"{amount:.2f}", category, note])
+
+
+# ---- Measurement ----
+def measure(name: str, fn, results: dict, trace_memory: bool, rows: int = None):
+    """Run fn() once with stdout silenced, storing seconds (and rows/sec, peak memory)."""
+    return bench_harness.measure(name, fn, results, trace_memory, rows, unit="rows")
+
+
+def run_size(tracker, n: int, args, workdir: str) -> dict:
+    print(f"\n== {n:,} rows ==")
+    csv_path = os.path.join(workdir, f"expenses_{n}.csv")
+    started = time.perf_counter()
+    write_csv(csv_path, n, args.years, args.seed)
+    print(f"  generated {csv_path} in {time.perf_counter() - started:.1f}s")
+
+    if args.backend == "sqlite":
+        db_path = os.path.join(workdir, f"bench_{n}.sqlite3")
+        tracker.set_backend(tracker.SQLiteBackend(db_path))
+    else:
+        tracker.set_backend(tracker.MySQLBackend(
+            tracker.DB_HOST, tracker.DB_USER, tracker.DB_NAME, password=tracker.get_db_password,
+            pool_size=tracker.DB_POOL_SIZE, pool_timeout=tracker.DB_POOL_TIMEOUT))
+    with tracker.session() as conn:
+        with tracker.get_backend().cursor(conn) as cur:
+            tracker.execute(cur, "DELETE FROM expenses")  # drop the seed rows, start empty
+    tracker.query_stats.reset()
+
+    results = {}
+    mem = args.memory
+    measure("import_csv_bulk", lambda: tracker.import_csv_bulk(csv_path, batch_size=args.batch_size),
+            results, mem, rows=n)
+
+    # The row-at-a-time paths are slow by design; time a bounded sample
+    sample = min(n, args.sample)
+    sample_path = os.path.join(workdir, f"sample_{sample}.csv")
+    write_csv(sample_path, sample, 1, args.seed + 1)
+    measure("import_csv", lambda: tracker.import_csv(sample_path), results, mem, rows=sample)
+    single = list(generate_rows(min(sample, 1000), 1, args.seed + 2))
+    measure("insert_expense", lambda: [tracker.insert_expense(*r) for r in single],
+            results, mem, rows=len(single))
+
+    last_year = date.today().year
+    month = f"{last_year}-06"
+    start, end = tracker.month_bounds(month)
+    measure("fetch_all_month", lambda: tracker.fetch_all(
+        "SELECT * FROM expenses WHERE occurred_on >= %s AND occurred_on < %s", (start, end)),
+        results, mem)
+    total = n + sample + len(single)
+    measure("iter_rows_all", lambda: sum(1 for _ in tracker.iter_rows("SELECT * FROM expenses")),
+            results, mem, rows=total)
+    measure("export_jsonl", lambda: tracker.export_expenses(os.devnull, fmt="jsonl"),
+            results, mem, rows=total)
+
+    cache = tracker.get_report_cache()
+    cache.clear()
+    measure("report_monthly_totals", tracker.report_monthly_totals, results, mem)
+    measure("report_monthly_totals_warm", tracker.report_monthly_totals, results, mem)
+    measure("report_category_breakdown", lambda: tracker.report_category_breakdown(month), results, mem)
+    measure("report_category_range_year",
+            lambda: tracker.report_category_range(date(last_year, 1, 1), date(last_year + 1, 1, 1)),
+            results, mem)
+    measure("rollup_verify", tracker.verify_rollups, results, mem)
+
+    results["query_stats"] = tracker.query_stats.snapshot()
+    if args.backend == "sqlite":
+        tracker.get_backend().close()
+        results["db_bytes"] = os.path.getsize(db_path)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Mini Expense Tracker")
+    bench_harness.add_arguments(parser, "row", out="bench_results.json")
+    parser.add_argument("--years", type=int, default=3, help="years of history to spread rows over")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--sample", type=int, default=10_000,
+                        help="rows for the row-at-a-time import/insert measurements")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    args = parser.parse_args(argv)
+
+    tracker = load_tracker()
+    tracker.query_stats.slow_ms = float("inf")  # keep the slow-query log quiet while benchmarking
+    tracker.REPORT_CACHE_PATH = None            # never touch the user's on-disk report cache
+    meta = {"backend": args.backend, "years": args.years, "batch_size": args.batch_size}
+    return bench_harness.run(args, meta, lambda n, args, workdir: run_size(tracker, n, args, workdir),
+                             what="rows")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Storage backends for the Mini Expense Tracker.
+
+The tracker writes its SQL once, MySQL-flavoured with %s placeholders, and
+asks the active backend for the few things that differ between engines:
+connections, cursors, placeholder style, month arithmetic and query plans.
+
+  MySQLBackend  - pooled mysql-connector connections (schema: init.sql)
+  SQLiteBackend - embedded file in WAL mode (schema: init_sqlite.sql)
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
+
+SQLITE_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "init_sqlite.sql")
+
+# The report cache's change counter, for files created before it existed.
+# Their rollup triggers do not bump it, so it gets triggers of its own.
+SQLITE_DATA_VERSION = """
+CREATE TABLE data_version (
+  id       INTEGER PRIMARY KEY,
+  epoch    CHAR(36) NOT NULL,
+  version  INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO data_version (id, epoch, version) VALUES (1, lower(hex(randomblob(16))), 0);
+CREATE TRIGGER trg_expenses_version_ai AFTER INSERT ON expenses
+BEGIN
+  UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER trg_expenses_version_ad AFTER DELETE ON expenses
+BEGIN
+  UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER trg_expenses_version_au AFTER UPDATE ON expenses
+BEGIN
+  UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+"""
+
+
+class Backend:
+    """What the tracker needs from a database engine."""
+
+    name = "base"
+    dsn = ""  # identifies the database, e.g. to tag cached results
+
+    def connect(self):
+        """Return a DB-API connection; hand it back with release()."""
+        raise NotImplementedError
+
+    def release(self, conn) -> None:
+        raise NotImplementedError
+
+    def begin(self, conn) -> None:
+        """Start an explicit transaction on conn."""
+        raise NotImplementedError
+
+    @contextmanager
+    def cursor(self, conn, dictionary: bool = False, stream: bool = False):
+        """
+        Cursor context manager. dictionary=True yields rows as dicts;
+        stream=True asks for rows to be fetched from the engine lazily.
+        """
+        raise NotImplementedError
+        yield
+
+    def prepare(self, sql: str, params: Optional[tuple]) -> tuple:
+        """Translate a %s-style statement and its params for this engine."""
+        return sql, params or ()
+
+    def prepare_many(self, sql: str, rows: List[tuple]) -> tuple:
+        """prepare() for executemany: one statement, many parameter rows."""
+        return sql, rows
+
+    def insert_ignore(self) -> str:
+        """INSERT keyword that silently skips rows hitting a unique key."""
+        raise NotImplementedError
+
+    def month_start(self, col: str) -> str:
+        """SQL expression for the first day of col's month."""
+        raise NotImplementedError
+
+    def next_month(self, col: str) -> str:
+        """SQL expression for col plus one month."""
+        raise NotImplementedError
+
+    def explain(self, conn, sql: str, params: Optional[tuple]) -> List[Dict]:
+        """
+        Plan sql and return one dict per table access with keys
+        table, access, index, detail and ok (True for index lookups/range scans).
+        """
+        raise NotImplementedError
+
+    def missing_table_errors(self) -> tuple:
+        """Exception classes raised for a query on a table that does not exist."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Drop any idle connections held by the backend."""
+
+
+class MySQLBackend(Backend):
+    name = "mysql"
+
+    def __init__(self, host: str, user: str, database: str, password: Callable[[], str],
+                 pool_size: int = 5, pool_timeout: float = 10.0):
+        self.host = host
+        self.user = user
+        self.database = database
+        self.password = password  # called once, when the pool is created
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.dsn = f"mysql://{user}@{host}/{database}"
+        self._pool = None
+
+    def get_pool(self):
+        """Create the shared connection pool on first use."""
+        if self._pool is None:
+            from mysql.connector import pooling
+            self._pool = pooling.MySQLConnectionPool(
+                pool_name="mini_expense",
+                pool_size=self.pool_size,
+                pool_reset_session=True,
+                host=self.host,
+                user=self.user,
+                password=self.password(),
+                database=self.database,
+            )
+        return self._pool
+
+    def connect(self):
+        """
+        Borrow a connection from the pool. The pool pings the connection on
+        checkout and reconnects it if the server dropped it while idle.
+        Waits up to pool_timeout seconds when every connection is in use.
+        """
+        from mysql.connector.errors import PoolError
+        deadline = time.monotonic() + self.pool_timeout
+        while True:
+            try:
+                return self.get_pool().get_connection()
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+
+    def release(self, conn) -> None:
+        conn.close()  # returns a pooled connection to the pool
+
+    def begin(self, conn) -> None:
+        conn.start_transaction()
+
+    @contextmanager
+    def cursor(self, conn, dictionary: bool = False, stream: bool = False):
+        cur = conn.cursor(dictionary=dictionary, buffered=False if stream else None)
+        try:
+            yield cur
+        finally:
+            if conn.unread_result:  # streamed result abandoned part way
+                conn.consume_results()
+            cur.close()
+
+    def insert_ignore(self) -> str:
+        return "INSERT IGNORE"
+
+    def missing_table_errors(self) -> tuple:
+        from mysql.connector.errors import ProgrammingError
+        return (ProgrammingError,)
+
+    def month_start(self, col: str) -> str:
+        return f"CAST(DATE_FORMAT({col}, '%Y-%m-01') AS DATE)"
+
+    def next_month(self, col: str) -> str:
+        return f"{col} + INTERVAL 1 MONTH"
+
+    def explain(self, conn, sql: str, params: Optional[tuple]) -> List[Dict]:
+        with self.cursor(conn, dictionary=True) as cur:
+            cur.execute("EXPLAIN " + sql, params or ())
+            rows = cur.fetchall()
+        return [{
+            "table": r["table"],
+            "access": r["type"],
+            "index": r["key"],
+            "detail": r.get("Extra"),
+            "ok": r["type"] in ("const", "eq_ref", "ref", "range") and bool(r["key"]),
+        } for r in rows]
+
+
+def _dict_row(cur, row) -> Dict:
+    return {d[0]: v for d, v in zip(cur.description, row)}
+
+
+def _sqlite_param(value):
+    # Store dates the way the schema expects them (ISO text) rather than
+    # relying on sqlite3's deprecated default adapters.
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class SQLiteBackend(Backend):
+    """
+    Embedded single-file database. Uses WAL so readers never block the
+    writer, and keeps a few idle connections around instead of reopening
+    the file (and re-running the PRAGMAs) for every call. The schema from
+    init_sqlite.sql is applied the first time a new file is opened; a file
+    created by an older version is upgraded in place (see _upgrade).
+    """
+
+    name = "sqlite"
+    _placeholder = re.compile(r"%s")
+
+    def __init__(self, path: str, max_idle: int = 5):
+        self.path = path
+        self.dsn = "sqlite:" + os.path.abspath(path)
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._schema_ready:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='expenses'"
+            ).fetchone()
+            if not exists:
+                with open(SQLITE_SCHEMA, encoding="utf-8") as f:
+                    conn.executescript(f.read())
+            else:
+                self._upgrade(conn)
+            self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def _upgrade(conn) -> None:
+        """Add what older versions of init_sqlite.sql lacked; each step is skipped once applied."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(expenses)")}
+        if "txn_hash" not in columns:  # 'ingest' deduplication
+            conn.execute("ALTER TABLE expenses ADD COLUMN txn_hash CHAR(64) NULL")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_txn_hash ON expenses (txn_hash)")
+        conn.commit()
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='data_version'"
+        ).fetchone():  # report cache watermark
+            conn.executescript(SQLITE_DATA_VERSION)
+
+    def connect(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def release(self, conn) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def begin(self, conn) -> None:
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+
+    @contextmanager
+    def cursor(self, conn, dictionary: bool = False, stream: bool = False):
+        # sqlite3 cursors always step through results lazily
+        cur = conn.cursor()
+        if dictionary:
+            cur.row_factory = _dict_row
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+    def prepare(self, sql: str, params: Optional[tuple]) -> tuple:
+        return self._placeholder.sub("?", sql), tuple(_sqlite_param(p) for p in params or ())
+
+    def prepare_many(self, sql: str, rows: List[tuple]) -> tuple:
+        return self._placeholder.sub("?", sql), [tuple(_sqlite_param(p) for p in r) for r in rows]
+
+    def insert_ignore(self) -> str:
+        return "INSERT OR IGNORE"
+
+    def missing_table_errors(self) -> tuple:
+        return (sqlite3.OperationalError,)
+
+    def month_start(self, col: str) -> str:
+        return f"strftime('%Y-%m-01', {col})"
+
+    def next_month(self, col: str) -> str:
+        return f"date({col}, '+1 month')"
+
+    def explain(self, conn, sql: str, params: Optional[tuple]) -> List[Dict]:
+        sql, params = self.prepare(sql, params)
+        plan = []
+        for _id, _parent, _unused, detail in conn.execute("EXPLAIN QUERY PLAN " + sql, params):
+            m = re.match(r"(SCAN|SEARCH) (\w+)(?: USING (?:COVERING )?(?:INDEX (\w+)|(INTEGER PRIMARY KEY|PRIMARY KEY)))?", detail)
+            if not m:
+                continue  # temp b-trees, subquery markers, ...
+            access, table, index, pk = m.groups()
+            plan.append({
+                "table": table,
+                "access": access.lower(),
+                "index": index or pk,
+                "detail": detail,
+                "ok": access == "SEARCH",
+            })
+        return plan
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
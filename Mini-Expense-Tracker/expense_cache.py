@@ -0,0 +1,142 @@
+"""
+Report result cache for the Mini Expense Tracker.
+
+Entries are keyed by (report name, parameters) and tagged with the data
+watermark they were computed at. The watermark comes from the data_version
+row that the expenses triggers bump on every insert, update and delete, so
+reading it is a single primary-key lookup; an entry is only served while
+the watermark is unchanged. Least recently used entries are evicted once
+max_entries is reached. An optional JSON file keeps the cache (and its
+counters) across runs. Cached rows are plain values, so JSON holds them
+with a few tagged types (tuples, dates, Decimals); unlike a pickle,
+loading a file someone else wrote cannot run their code.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def _to_json(value: Any) -> Any:
+    """value with the types JSON lacks turned into tagged objects."""
+    if isinstance(value, tuple):
+        return {"__tuple__": [_to_json(v) for v in value]}
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, datetime):  # before date: a datetime is a date too
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    return value
+
+
+def _from_json(value: Any) -> Any:
+    """The inverse of _to_json."""
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    if isinstance(value, dict):
+        if len(value) == 1:
+            (tag, inner), = value.items()
+            if tag == "__tuple__":
+                return tuple(_from_json(v) for v in inner)
+            if tag == "__datetime__":
+                return datetime.fromisoformat(inner)
+            if tag == "__date__":
+                return date.fromisoformat(inner)
+            if tag == "__decimal__":
+                return Decimal(inner)
+        return {k: _from_json(v) for k, v in value.items()}
+    return value
+
+
+class ReportCache:
+    def __init__(self, max_entries: int = 128, path: Optional[str] = None, owner: str = ""):
+        """
+        path:  optional file for the on-disk copy (load() / save()).
+        owner: identifies the database the entries belong to; a disk copy
+               written for another database is ignored on load.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.owner = owner
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, watermark: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key if still current, else compute and store it."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == watermark:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+            self.invalidations += 1
+        self.misses += 1
+        value = compute()
+        self._entries[key] = (watermark, value)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+    def load(self) -> None:
+        """Restore the on-disk copy, if there is one for this owner."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = _from_json(json.load(f))
+            if data.get("owner") != self.owner:
+                return
+            entries = OrderedDict((key, tuple(entry)) for key, entry in data["entries"])
+            stats = {name: int(data["stats"].get(name, 0))
+                     for name in ("hits", "misses", "invalidations", "evictions")}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return  # unreadable cache file (or an old pickle one): start cold
+        self._entries = entries
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        for name, count in stats.items():
+            setattr(self, name, count)
+
+    def save(self) -> None:
+        """Write the on-disk copy atomically (temp file + rename)."""
+        if not self.path:
+            return
+        data = {
+            "owner": self.owner,
+            "entries": [[key, entry] for key, entry in self._entries.items()],
+            "stats": self.stats(),
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_to_json(data), f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,107 @@
+"""
+CSV parsing for the Mini Expense Tracker.
+
+Kept in its own importable module so statement files can be parsed in
+worker processes (see ingest_directory in Mini-Expense-Tracker.py).
+"""
+
+import csv
+import hashlib
+from datetime import date
+from typing import Dict, List, Tuple
+
+
+def parse_csv_row(r: Dict[str, str]) -> tuple:
+    """
+    Normalize one CSV row into (occurred_on, amount, category, note).
+    Column names are matched case-insensitively. Raises ValueError for rows
+    that would not fit the expenses table.
+    """
+    row = {(k or "").strip().lower(): v for k, v in r.items()}
+    occurred_on = (row.get("date") or "").strip()
+    if not occurred_on:
+        raise ValueError("missing date")
+    occurred_on = date.fromisoformat(occurred_on).isoformat()  # raises ValueError if not a date
+    raw_amount = (row.get("amount") or "").strip()
+    if not raw_amount:
+        raise ValueError("missing amount")
+    amount = round(float(raw_amount), 2)
+    if abs(amount) >= 10**8:
+        raise ValueError(f"amount out of range: {raw_amount}")
+    category = (row.get("category") or "").strip() or "Uncategorized"
+    if len(category) > 50:
+        raise ValueError("category longer than 50 characters")
+    note = (row.get("note") or "").strip() or None
+    if note and len(note) > 200:
+        raise ValueError("note longer than 200 characters")
+    return occurred_on, amount, category, note
+
+
+def txn_hash(occurred_on: str, amount: float, category: str, note, ordinal: int, run: int = 0) -> str:
+    """
+    Content hash of a normalized transaction, stored in expenses.txn_hash.
+    ordinal tells apart identical rows within one file (two 3.50 coffees on
+    the same day): the first copy gets 0, the next 1, and so on, so a file
+    always hashes to the same set no matter how often it is re-imported.
+    run tells apart the stretches of one date in a file that is not in
+    date order (see RowHasher). Category is compared case-insensitively,
+    like the database collation.
+    """
+    key = f"{occurred_on}|{amount:.2f}|{category.casefold()}|{note or ''}|{ordinal}"
+    if run:
+        key += f"|{run}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class RowHasher:
+    """
+    Adds txn_hash to the rows of one file, in file order; use a new one
+    per file so every command that loads the file gives the same hashes.
+
+    Copies are only counted within the current stretch of rows sharing a
+    date, so memory is bounded by the largest such stretch (a day of
+    transactions in a statement), not the file. A date that comes back
+    after other dates starts a new run, numbered so its rows cannot take
+    the hashes of the earlier stretch; only the per-date run counters
+    outlive a stretch, one small int per distinct date.
+    """
+
+    def __init__(self):
+        self._date = None
+        self._run = 0
+        self._seen: Dict[tuple, int] = {}  # copies in the current stretch
+        self._runs: Dict[str, int] = {}    # date -> stretches of it so far
+
+    def __call__(self, parsed: tuple) -> tuple:
+        """parsed (from parse_csv_row) plus its txn_hash."""
+        occurred_on, amount, category, note = parsed
+        if occurred_on != self._date:
+            self._date = occurred_on
+            self._run = self._runs.get(occurred_on, 0)
+            self._runs[occurred_on] = self._run + 1
+            self._seen.clear()
+        key = (amount, category.casefold(), note)
+        ordinal = self._seen.get(key, 0)
+        self._seen[key] = ordinal + 1
+        return parsed + (txn_hash(*parsed, ordinal, self._run),)
+
+
+def parse_statement(path: str) -> Tuple[str, List[tuple], List[Tuple[int, str]]]:
+    """
+    Parse a whole CSV statement.
+    Returns (path, rows, errors) where rows are
+    (occurred_on, amount, category, note, txn_hash) and errors are
+    (line_number, message) for rows that were skipped.
+    """
+    rows, errors = [], []
+    with_hash = RowHasher()
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for r in reader:
+            try:
+                parsed = parse_csv_row(r)
+            except (ValueError, TypeError) as e:
+                errors.append((reader.line_num, str(e)))
+                continue
+            rows.append(with_hash(parsed))
+    return path, rows, errors
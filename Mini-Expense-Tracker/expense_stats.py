@@ -0,0 +1,193 @@
+"""
+Query instrumentation for the Mini Expense Tracker.
+
+Every statement the tracker runs is recorded under a normalized SQL
+fingerprint (literals and placeholders replaced by ?, whitespace folded)
+with its execute time, fetch/decode time and row count. Connection
+checkout is timed separately. Latencies go into fixed log-scale
+histograms, so memory stays constant however many queries run, and
+p50/p95/p99 are read off the buckets (within ~10%). Statements slower than
+the slow-query threshold are appended to a slow-query log.
+"""
+
+import json
+import math
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Bucket i holds latencies up to _BASE * _GROWTH**i seconds: 1us .. ~10min
+_BASE = 1e-6
+_GROWTH = 2 ** 0.25
+_BUCKETS = 120
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (_BUCKETS + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        if seconds <= _BASE:
+            i = 0
+        else:
+            i = min(_BUCKETS, math.ceil(math.log(seconds / _BASE, _GROWTH)))
+        self.counts[i] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th percentile, in seconds."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * pct / 100)
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_BASE * _GROWTH ** i, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1e3,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p95_ms": self.percentile(95) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max * 1e3,
+        }
+
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%s|\?")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql: str) -> str:
+    """'SELECT * FROM t WHERE id = 42 AND d >= %s' -> 'SELECT * FROM t WHERE id = ? AND d >= ?'"""
+    fp = _COMMENTS.sub(" ", sql)
+    fp = _STRINGS.sub("?", fp)
+    fp = _NUMBERS.sub("?", fp)
+    fp = _PLACEHOLDERS.sub("?", fp)
+    fp = _IN_LISTS.sub("(...)", fp)
+    return _SPACES.sub(" ", fp).strip().rstrip(";")
+
+
+class StatementStats:
+    __slots__ = ("calls", "rows", "execute", "fetch", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.execute = Histogram()
+        self.fetch = Histogram()
+        self.latency = Histogram()  # execute + fetch
+
+
+class QueryStats:
+    def __init__(self, slow_ms: float = 200.0, slow_log: Optional[str] = None, enabled: bool = True):
+        """
+        slow_ms:  statements taking at least this long are written to the slow log
+        slow_log: file to append slow queries to (None -> stderr)
+        """
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self.connect = Histogram()
+        self.statements: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def record_connect(self, seconds: float) -> None:
+        if self.enabled:
+            with self._lock:
+                self.connect.add(seconds)
+
+    def record(self, sql: str, execute_s: float, fetch_s: float = 0.0, rows: int = 0) -> None:
+        if not self.enabled:
+            return
+        fp = fingerprint(sql)
+        total = execute_s + fetch_s
+        with self._lock:
+            st = self.statements.get(fp)
+            if st is None:
+                st = self.statements[fp] = StatementStats()
+            st.calls += 1
+            st.rows += max(rows, 0)
+            st.execute.add(execute_s)
+            st.fetch.add(fetch_s)
+            st.latency.add(total)
+        if total * 1e3 >= self.slow_ms:
+            self._log_slow(fp, execute_s, fetch_s, rows)
+
+    def _log_slow(self, fp: str, execute_s: float, fetch_s: float, rows: int) -> None:
+        line = (f"{time.strftime('%Y-%m-%d %H:%M:%S')} slow query "
+                f"{(execute_s + fetch_s) * 1e3:.1f}ms (execute {execute_s * 1e3:.1f}ms, "
+                f"fetch {fetch_s * 1e3:.1f}ms, rows {rows}): {fp}\n")
+        if self.slow_log:
+            with open(self.slow_log, "a", encoding="utf-8") as f:
+                f.write(line)
+        else:
+            sys.stderr.write(line)
+
+    def snapshot(self) -> Dict:
+        """All counters as plain data, slowest statements (by total time) first."""
+        with self._lock:
+            statements = sorted(self.statements.items(), key=lambda kv: -kv[1].latency.total)
+            return {
+                "connect": self.connect.summary(),
+                "statements": [{
+                    "fingerprint": fp,
+                    "calls": st.calls,
+                    "rows": st.rows,
+                    "latency": st.latency.summary(),
+                    "execute": st.execute.summary(),
+                    "fetch": st.fetch.summary(),
+                } for fp, st in statements],
+            }
+
+    def format(self) -> str:
+        snap = self.snapshot()
+        c = snap["connect"]
+        lines = [f"connect: {c['count']} checkouts, p50 {c['p50_ms']:.2f}ms, "
+                 f"p95 {c['p95_ms']:.2f}ms, p99 {c['p99_ms']:.2f}ms, max {c['max_ms']:.2f}ms",
+                 f"{'calls':>7} {'rows':>9} {'total ms':>10} {'p50':>8} {'p95':>8} {'p99':>8} "
+                 f"{'exec ms':>9} {'fetch ms':>9}  statement"]
+        for st in snap["statements"]:
+            lat = st["latency"]
+            fp = st["fingerprint"]
+            lines.append(f"{st['calls']:>7} {st['rows']:>9} {lat['total_ms']:>10.1f} "
+                         f"{lat['p50_ms']:>8.2f} {lat['p95_ms']:>8.2f} {lat['p99_ms']:>8.2f} "
+                         f"{st['execute']['total_ms']:>9.1f} {st['fetch']['total_ms']:>9.1f}  "
+                         f"{fp[:100] + '...' if len(fp) > 100 else fp}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str = "-") -> None:
+        """Write stats to path ('-' for stdout); JSON if path ends in .json, else a table."""
+        if path == "-":
+            sys.stdout.write(self.format())
+            return
+        with open(path, "w", encoding="utf-8") as out:
+            if path.endswith(".json"):
+                json.dump(self.snapshot(), out, indent=2)
+            else:
+                out.write(self.format())
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connect = Histogram()
+            self.statements.clear()
@@ -11,29 +11,100 @@ CREATE TABLE expenses (
   category     VARCHAR(50) NOT NULL,
   note         VARCHAR(200) NULL,
   created_at   TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-  KEY idx_date (occurred_on),
+  txn_hash     CHAR(64) NULL,            -- content hash set by 'ingest'; makes re-imports idempotent
+  UNIQUE KEY uq_txn_hash (txn_hash),
+  -- Covers date-range reports: range scan on occurred_on, category/amount read from the index.
+  -- Also serves plain occurred_on lookups as its leftmost prefix.
+  KEY idx_date_cat_amount (occurred_on, category, amount),
   KEY idx_category (category)
 );
 
+-- Monthly rollup per (month, category), kept current by the triggers below
+-- so reports never have to re-aggregate the whole expenses table.
+-- Rebuild/verify from the client: python Mini-Expense-Tracker.py rollup rebuild|verify
+CREATE TABLE monthly_category_totals (
+  month_start  DATE NOT NULL,
+  category     VARCHAR(50) NOT NULL,
+  total_amount DECIMAL(14,2) NOT NULL DEFAULT 0,
+  txn_count    INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (month_start, category)
+);
+
+-- Change counter bumped by the triggers below. Report caches compare
+-- (epoch, version) to decide whether a cached result is still current;
+-- epoch changes whenever the database is recreated.
+CREATE TABLE data_version (
+  id       TINYINT PRIMARY KEY,
+  epoch    CHAR(36) NOT NULL,
+  version  BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO data_version (id, epoch, version) VALUES (1, UUID(), 0);
+
+DELIMITER $$
+
+CREATE TRIGGER trg_expenses_ai AFTER INSERT ON expenses FOR EACH ROW
+BEGIN
+  INSERT INTO monthly_category_totals (month_start, category, total_amount, txn_count)
+  VALUES (DATE_FORMAT(NEW.occurred_on, '%Y-%m-01'), NEW.category, NEW.amount, 1)
+  ON DUPLICATE KEY UPDATE
+    total_amount = total_amount + NEW.amount,
+    txn_count = txn_count + 1;
+  UPDATE data_version SET version = version + 1 WHERE id = 1;
+END$$
+
+CREATE TRIGGER trg_expenses_ad AFTER DELETE ON expenses FOR EACH ROW
+BEGIN
+  UPDATE monthly_category_totals
+     SET total_amount = total_amount - OLD.amount,
+         txn_count = txn_count - 1
+   WHERE month_start = DATE_FORMAT(OLD.occurred_on, '%Y-%m-01')
+     AND category = OLD.category;
+  DELETE FROM monthly_category_totals
+   WHERE month_start = DATE_FORMAT(OLD.occurred_on, '%Y-%m-01')
+     AND category = OLD.category
+     AND txn_count = 0;
+  UPDATE data_version SET version = version + 1 WHERE id = 1;
+END$$
+
+CREATE TRIGGER trg_expenses_au AFTER UPDATE ON expenses FOR EACH ROW
+BEGIN
+  UPDATE monthly_category_totals
+     SET total_amount = total_amount - OLD.amount,
+         txn_count = txn_count - 1
+   WHERE month_start = DATE_FORMAT(OLD.occurred_on, '%Y-%m-01')
+     AND category = OLD.category;
+  DELETE FROM monthly_category_totals
+   WHERE month_start = DATE_FORMAT(OLD.occurred_on, '%Y-%m-01')
+     AND category = OLD.category
+     AND txn_count = 0;
+  INSERT INTO monthly_category_totals (month_start, category, total_amount, txn_count)
+  VALUES (DATE_FORMAT(NEW.occurred_on, '%Y-%m-01'), NEW.category, NEW.amount, 1)
+  ON DUPLICATE KEY UPDATE
+    total_amount = total_amount + NEW.amount,
+    txn_count = txn_count + 1;
+  UPDATE data_version SET version = version + 1 WHERE id = 1;
+END$$
+
+DELIMITER ;
+
 -- A simple monthly totals view
 CREATE OR REPLACE VIEW v_monthly_totals AS
 SELECT
-  DATE_FORMAT(occurred_on, '%Y-%m-01') AS month_start,
-  ROUND(SUM(amount), 2) AS net_amount
-FROM expenses
-GROUP BY DATE_FORMAT(occurred_on, '%Y-%m-01')
+  month_start,
+  ROUND(SUM(total_amount), 2) AS net_amount
+FROM monthly_category_totals
+GROUP BY month_start
 ORDER BY month_start;
 
 -- Category breakdown per month view
 CREATE OR REPLACE VIEW v_monthly_category AS
 SELECT
-  DATE_FORMAT(occurred_on, '%Y-%m-01') AS month_start,
+  month_start,
   category,
-  ROUND(SUM(amount), 2) AS total_amount,
-  COUNT(*) AS txn_count
-FROM expenses
-GROUP BY DATE_FORMAT(occurred_on, '%Y-%m-01'), category
-ORDER BY month_start, ABS(SUM(amount)) DESC;
+  total_amount,
+  txn_count
+FROM monthly_category_totals
+ORDER BY month_start, ABS(total_amount) DESC;
 
 -- Seed a few example rows
 INSERT INTO expenses (occurred_on, amount, category, note) VALUES
@@ -47,3 +118,28 @@ INSERT INTO expenses (occurred_on, amount, category, note) VALUES
 -- Handy queries (uncomment in Workbench to try)
 -- SELECT * FROM v_monthly_totals;
 -- SELECT * FROM v_monthly_category WHERE month_start='2025-09-01';
+
+-- Upgrading a database created by an older version of this file (this
+-- script drops the database, so run these by hand instead; skip any step
+-- whose column or index already exists):
+--
+-- txn_hash, for 'ingest' and idempotent 'import':
+-- ALTER TABLE expenses
+--   ADD COLUMN txn_hash CHAR(64) NULL,
+--   ADD UNIQUE KEY uq_txn_hash (txn_hash);
+--
+-- data_version, for the report cache (older rollup triggers do not bump
+-- it, so it gets triggers of its own; needs MySQL 5.7.2+ for a second
+-- trigger on the same event):
+-- CREATE TABLE data_version (
+--   id       TINYINT PRIMARY KEY,
+--   epoch    CHAR(36) NOT NULL,
+--   version  BIGINT NOT NULL DEFAULT 0
+-- );
+-- INSERT INTO data_version (id, epoch, version) VALUES (1, UUID(), 0);
+-- CREATE TRIGGER trg_expenses_version_ai AFTER INSERT ON expenses FOR EACH ROW
+--   UPDATE data_version SET version = version + 1 WHERE id = 1;
+-- CREATE TRIGGER trg_expenses_version_ad AFTER DELETE ON expenses FOR EACH ROW
+--   UPDATE data_version SET version = version + 1 WHERE id = 1;
+-- CREATE TRIGGER trg_expenses_version_au AFTER UPDATE ON expenses FOR EACH ROW
+--   UPDATE data_version SET version = version + 1 WHERE id = 1;
@@ -0,0 +1,105 @@
+-- Mini Expense Tracker (SQLite 3.24+), same schema as init.sql.
+-- Applied automatically by the SQLite backend when it creates a new file.
+
+CREATE TABLE IF NOT EXISTS expenses (
+  expense_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+  occurred_on  DATE NOT NULL,                 -- 'YYYY-MM-DD'
+  amount       DECIMAL(10,2) NOT NULL,        -- negative = expense, positive = income
+  category     VARCHAR(50) NOT NULL COLLATE NOCASE,
+  note         VARCHAR(200) NULL,
+  created_at   TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  txn_hash     CHAR(64) NULL                  -- content hash set by 'ingest'; makes re-imports idempotent
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_txn_hash ON expenses (txn_hash);
+CREATE INDEX IF NOT EXISTS idx_date_cat_amount ON expenses (occurred_on, category, amount);
+CREATE INDEX IF NOT EXISTS idx_category ON expenses (category);
+
+-- Monthly rollup per (month, category), kept current by the triggers below
+CREATE TABLE IF NOT EXISTS monthly_category_totals (
+  month_start  DATE NOT NULL,
+  category     VARCHAR(50) NOT NULL COLLATE NOCASE,
+  total_amount DECIMAL(14,2) NOT NULL DEFAULT 0,
+  txn_count    INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (month_start, category)
+) WITHOUT ROWID;
+
+-- Change counter bumped by the triggers below (see init.sql)
+CREATE TABLE IF NOT EXISTS data_version (
+  id       INTEGER PRIMARY KEY,
+  epoch    CHAR(36) NOT NULL,
+  version  INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO data_version (id, epoch, version) VALUES (1, lower(hex(randomblob(16))), 0);
+
+-- Amounts are REAL in SQLite, so running totals are re-rounded to cents
+-- on every change to keep them equal to a fresh SUM().
+CREATE TRIGGER IF NOT EXISTS trg_expenses_ai AFTER INSERT ON expenses
+BEGIN
+  INSERT INTO monthly_category_totals (month_start, category, total_amount, txn_count)
+  VALUES (strftime('%Y-%m-01', NEW.occurred_on), NEW.category, NEW.amount, 1)
+  ON CONFLICT (month_start, category) DO UPDATE SET
+    total_amount = ROUND(total_amount + excluded.total_amount, 2),
+    txn_count = txn_count + 1;
+  UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_expenses_ad AFTER DELETE ON expenses
+BEGIN
+  UPDATE monthly_category_totals
+     SET total_amount = ROUND(total_amount - OLD.amount, 2),
+         txn_count = txn_count - 1
+   WHERE month_start = strftime('%Y-%m-01', OLD.occurred_on)
+     AND category = OLD.category;
+  DELETE FROM monthly_category_totals
+   WHERE month_start = strftime('%Y-%m-01', OLD.occurred_on)
+     AND category = OLD.category
+     AND txn_count = 0;
+  UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_expenses_au AFTER UPDATE ON expenses
+BEGIN
+  UPDATE monthly_category_totals
+     SET total_amount = ROUND(total_amount - OLD.amount, 2),
+         txn_count = txn_count - 1
+   WHERE month_start = strftime('%Y-%m-01', OLD.occurred_on)
+     AND category = OLD.category;
+  DELETE FROM monthly_category_totals
+   WHERE month_start = strftime('%Y-%m-01', OLD.occurred_on)
+     AND category = OLD.category
+     AND txn_count = 0;
+  INSERT INTO monthly_category_totals (month_start, category, total_amount, txn_count)
+  VALUES (strftime('%Y-%m-01', NEW.occurred_on), NEW.category, NEW.amount, 1)
+  ON CONFLICT (month_start, category) DO UPDATE SET
+    total_amount = ROUND(total_amount + excluded.total_amount, 2),
+    txn_count = txn_count + 1;
+  UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+-- A simple monthly totals view
+CREATE VIEW IF NOT EXISTS v_monthly_totals AS
+SELECT
+  month_start,
+  ROUND(SUM(total_amount), 2) AS net_amount
+FROM monthly_category_totals
+GROUP BY month_start
+ORDER BY month_start;
+
+-- Category breakdown per month view
+CREATE VIEW IF NOT EXISTS v_monthly_category AS
+SELECT
+  month_start,
+  category,
+  total_amount,
+  txn_count
+FROM monthly_category_totals
+ORDER BY month_start, ABS(total_amount) DESC;
+
+-- Seed a few example rows
+INSERT INTO expenses (occurred_on, amount, category, note) VALUES
+('2025-08-01', -120.50, 'Groceries', 'WF run'),
+('2025-08-02', -15.00,  'Dining',    'Burrito'),
+('2025-08-15', 2000.00, 'Income',    'Paycheck'),
+('2025-09-03', -35.75,  'Transportation', 'Metro card'),
+('2025-09-05', -110.30, 'Utilities', 'Electric'),
+('2025-09-15', 2000.00, 'Income',    'Paycheck');
@@ -0,0 +1,51 @@
+"""
+The report queries must stay index lookups / range scans.
+
+Runs EXPLAIN on them against a temporary SQLite database, so it needs no
+MySQL server:
+
+  python -m pytest -q Mini-Expense-Tracker/test_explain.py
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope="module")
+def tracker():
+    """Mini-Expense-Tracker.py (its file name is not a valid module name)."""
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    spec = importlib.util.spec_from_file_location("mini_expense_tracker",
+                                                  os.path.join(HERE, "Mini-Expense-Tracker.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def sqlite_db(tracker, tmp_path):
+    backend = tracker.SQLiteBackend(str(tmp_path / "explain.sqlite3"))
+    tracker.set_backend(backend)
+    yield backend
+    backend.close()
+
+
+def test_report_queries_use_indexes(tracker, sqlite_db):
+    assert tracker.explain_report_queries("2025-09") == []
+
+
+def test_category_range_scans_idx_date_cat_amount(tracker, sqlite_db):
+    start, end = tracker.month_bounds("2025-09")
+    with tracker.session() as conn:
+        steps = sqlite_db.explain(conn, *tracker.category_totals_query(start, end))
+    expenses = [step for step in steps if step["table"] == "expenses"]
+    assert expenses, steps
+    for step in expenses:
+        assert step["ok"], step
+        assert step["index"] == "idx_date_cat_amount", step
@@ -0,0 +1,190 @@
+"""
+Scaling benchmark for the to-do list.
+
+Generates synthetic lists in the todo_data.json schema (mixed priorities
+and categories, about a third completed, due dates spread around today so
+every view has overdue, due-today and future tasks), then times
+SimpleTodoList on each: loading, saving, every view_tasks filter,
+search_tasks, id lookups, changes through the API and a batch, and
+clearing completed tasks. Results are written as JSON so two runs (say,
+before and after a change) can be compared with --compare.
+
+  python bench_todo.py                                  # 10k tasks, JSON snapshot
+  python bench_todo.py --sizes 10k,100k,1m --memory --out results.json
+  python bench_todo.py --sizes 100k --format bin --compare baseline.json
+
+Everything runs on copies in a temp directory; the real todo_data files
+are never touched. The timing, results file and --compare come from
+bench_harness.py at the top of the repository.
+"""
+
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+for path in (HERE, ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import bench_harness  # noqa: E402
+from priority_to_do_list import SimpleTodoList  # noqa: E402
+from todo_snapshot import write_snapshot  # noqa: E402
+
+# ---- Synthetic data ----
+PRIORITY_WEIGHTS = [("High", 2), ("Medium", 5), ("Low", 3)]
+CATEGORIES = [("General", 30), ("Work", 25), ("Home", 15), ("Shopping", 10),
+              ("Health", 8), ("Finance", 7), ("Errands", 5)]
+VERBS = ["Call", "Email", "Buy", "Fix", "Write", "Review", "Plan", "Clean", "Pay", "Book"]
+OBJECTS = ["dentist", "report", "groceries", "bike", "taxes", "invoice", "garden",
+           "flights", "slides", "insurance", "birthday gift", "kitchen sink"]
+SEARCH_TERMS = ["report", "tax", "gift", "work", "zzz-no-match"]
+
+
+def generate_tasks(n: int, seed: int = 42):
+    """n task dicts in the todo_data.json schema, ids 1..n."""
+    rng = random.Random(seed)
+    today = date.today()
+    priorities, p_weights = zip(*PRIORITY_WEIGHTS)
+    categories, c_weights = zip(*CATEGORIES)
+    tasks = []
+    for i in range(1, n + 1):
+        created = today - timedelta(days=rng.randrange(365))
+        done = rng.random() < 0.3
+        roll = rng.random()
+        if roll < 0.25:
+            due = None
+        elif roll < 0.30:
+            due = today                                          # due today
+        elif roll < 0.55:
+            due = today - timedelta(days=rng.randrange(1, 120))  # overdue
+        else:
+            due = today + timedelta(days=rng.randrange(1, 180))
+        tasks.append({
+            "id": i,
+            "title": f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} #{i}",
+            "description": "" if rng.random() < 0.6 else f"Notes for task {i}: {rng.choice(OBJECTS)}",
+            "priority": rng.choices(priorities, p_weights)[0],
+            "category": rng.choices(categories, c_weights)[0],
+            "completed": done,
+            "created": created.isoformat(),
+            "due_date": due.isoformat() if due else None,
+            "completed_date": f"{(created + timedelta(days=1)).isoformat()} 12:00:00" if done else None,
+        })
+    return tasks
+
+
+def write_data(path: str, tasks) -> None:
+    if path.endswith(".bin"):
+        write_snapshot(path, tasks, 0, len(tasks) + 1)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"tasks": tasks, "journal_seq": 0, "next_id": len(tasks) + 1}, f, indent=2)
+
+
+# ---- Measurement ----
+@contextlib.contextmanager
+def answers(*replies):
+    """Feed replies to input() (the interactive methods prompt); then 'q' forever."""
+    queue = list(replies)
+    original = builtins.input
+    builtins.input = lambda prompt="": queue.pop(0) if queue else "q"
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+def measure(name: str, fn, results: dict, trace_memory: bool, ops: int = None):
+    """Run fn() once with stdout silenced, storing seconds (and ops/sec, peak memory)."""
+    return bench_harness.measure(name, fn, results, trace_memory, ops, unit="ops")
+
+
+def run_size(n: int, args, workdir: str) -> dict:
+    print(f"\n== {n:,} tasks ==")
+    path = os.path.join(workdir, f"todo_{n}.{args.format}")
+    started = time.perf_counter()
+    write_data(path, generate_tasks(n, args.seed))
+    print(f"  generated {path} in {time.perf_counter() - started:.1f}s")
+
+    results = {}
+    mem = args.memory
+    # A lazily opened binary snapshot decodes nothing until the store is needed
+    todo = measure("open", lambda: SimpleTodoList(path), results, mem)
+    if args.format == "bin":
+        with answers():
+            measure("view_today_lazy", lambda: todo.view_tasks("today", show_completed=False),
+                    results, mem)
+    measure("load_tasks", lambda: (todo.load_tasks(), len(todo.store)), results, mem, ops=n)
+
+    rng = random.Random(args.seed + 1)
+    ids = [rng.randrange(1, n + 1) for _ in range(min(n, args.lookups))]
+    measure("lookup_id", lambda: sum(1 for i in ids if todo.store.get(i) is not None),
+            results, mem, ops=len(ids))
+
+    # Each view prints its first page and is then left with 'q'
+    for name, kwargs in (("view_all", {}),
+                         ("view_high", {"filter_by": "high", "show_completed": False}),
+                         ("view_today", {"filter_by": "today", "show_completed": False}),
+                         ("view_overdue", {"filter_by": "overdue"})):
+        with answers():
+            measure(name, lambda: todo.view_tasks(**kwargs), results, mem)
+
+    # The first search builds the text index; the rest use it
+    with answers(SEARCH_TERMS[0]):
+        measure("search_first", todo.search_tasks, results, mem)
+    with answers(*SEARCH_TERMS[1:]):
+        measure("search_warm", lambda: [todo.search_tasks() for _ in SEARCH_TERMS[1:]],
+                results, mem, ops=len(SEARCH_TERMS) - 1)
+
+    changes = min(n, args.changes)
+    targets = rng.sample(range(1, n + 1), changes)
+    measure("api_add", lambda: [todo.add(f"New task {i}", priority="High", due_date=i % 30)
+                                for i in range(changes)], results, mem, ops=changes)
+    measure("api_edit", lambda: [todo.edit(i, category="Bench") for i in targets],
+            results, mem, ops=changes)
+    measure("api_complete", lambda: [todo.complete(i) for i in targets if not todo.store.get(i)['completed']],
+            results, mem, ops=changes)
+    measure("save_tasks", todo.save_tasks, results, mem)
+    lines = [json.dumps({"op": "add", "title": f"Batch task {i}", "due_date": i % 10}) for i in range(changes)]
+    measure("apply_batch", lambda: todo.apply_batch(lines), results, mem, ops=changes)
+    measure("compact", lambda: todo.journal.compact(todo.store), results, mem, ops=len(todo.store))
+
+    with answers("y"):
+        measure("clear_completed_tasks", todo.clear_completed_tasks, results, mem)
+
+    def renumber():
+        # Ids are stable now; renumbering only happens when an old journal is replayed
+        with todo._locked():
+            todo.store.renumber()
+    measure("renumber", renumber, results, mem, ops=len(todo.store))
+    measure("save_tasks_after_clear", todo.save_tasks, results, mem)
+
+    todo.journal.close()
+    results["file_bytes"] = os.path.getsize(path)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the to-do list")
+    bench_harness.add_arguments(parser, "task", out="bench_todo_results.json")
+    parser.add_argument("--format", choices=["json", "bin"], default="json",
+                        help="snapshot format to benchmark (todo_data.json or todo_data.bin)")
+    parser.add_argument("--lookups", type=int, default=100_000, help="random id lookups to time")
+    parser.add_argument("--changes", type=int, default=1_000,
+                        help="tasks added/edited/completed through the API, and batch size")
+    args = parser.parse_args(argv)
+
+    meta = {"format": args.format, "changes": args.changes}
+    return bench_harness.run(args, meta, run_size, what="tasks")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,36 +2,330 @@
 Simple To-Do List Application
 """
 
+import argparse
 import json
 import os
-from datetime import datetime, timedelta
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from todo_journal import JournalError, TaskJournal
+from todo_render import TaskRenderer, format_line
+from todo_search import TextIndex
+from todo_store import TaskStore
+
+PRIORITIES = ("High", "Medium", "Low")
+EDITABLE_FIELDS = ("title", "description", "priority", "category", "due_date")
+
+
+class ConflictError(ValueError):
+    """Another process changed the same task fields since they were read."""
+
+
+def parse_due(value):
+    """
+    A due date given as 'YYYY-MM-DD', a number of days from today (int or
+    digit string) or None/'' for no due date, as 'YYYY-MM-DD' or None.
+    Raises ValueError for anything else.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        try:
+            return (datetime.now() + timedelta(days=value)).strftime("%Y-%m-%d")
+        except OverflowError:
+            raise ValueError(f"due date out of range: {value} days from today") from None
+    if isinstance(value, str):
+        value = value.strip()
+        if value.isdigit():
+            return parse_due(int(value))
+        datetime.strptime(value, "%Y-%m-%d")
+        return value
+    raise ValueError(f"invalid due date: {value!r}")
+
+
+def _check_fields(fields):
+    """Validate and normalize task fields given to add/edit; raises ValueError."""
+    for name in ('title', 'description', 'category'):
+        if name in fields:
+            value = fields[name]
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{name} must be text, not {type(value).__name__}")
+            fields[name] = (value or "").strip()
+    if 'title' in fields and not fields['title']:
+        raise ValueError("a task needs a title")
+    if 'category' in fields:
+        fields['category'] = fields['category'] or "General"
+    if 'priority' in fields and (not isinstance(fields['priority'], str)
+                                 or fields['priority'] not in PRIORITIES):
+        raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}, not {fields['priority']!r}")
+    if 'due_date' in fields:
+        fields['due_date'] = parse_due(fields['due_date'])
+    return fields
+
 
 class SimpleTodoList:
-    def __init__(self):
-        self.tasks = []
-        # Create data file path in the same directory as the script
+    def __init__(self, data_file=None, page_size=20):
+        self.page_size = page_size  # tasks per page in view_tasks
+        self._store = None
+        self._snapshot = None
+        self._replaying = False
+        # Create data file path in the same directory as the script; a binary
+        # snapshot (see todo_snapshot.py) is used instead of the JSON once it exists
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        self.data_file = os.path.join(script_dir, "todo_data.json")
+        binary_file = os.path.join(script_dir, "todo_data.bin")
+        self.data_file = data_file or (binary_file if os.path.exists(binary_file)
+                                       else os.path.join(script_dir, "todo_data.json"))
+        # Changes are appended to todo_data.journal as they happen, under a lock
+        # shared with other processes using the same file; see todo_journal.py
+        self.journal = TaskJournal(self.data_file)
         self.load_tasks()
     
-    def load_tasks(self):
-        """Load tasks from file"""
+    @property
+    def store(self):
+        """The indexed tasks, decoded from the snapshot on first use"""
+        if self._store is None:
+            self._load_store()
+        return self._store
+    
+    def _load_store(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    self.tasks = json.load(f).get('tasks', [])
-        except:
-            self.tasks = []
+            self._store = TaskStore(self.journal.load())
+        except (OSError, JournalError) as e:
+            print(f"Error loading tasks: {e}")
+            raise
+        # Never hand out an id that was used before, even if that task is gone
+        self._store.next_id = max(self._store.next_id, self.journal.next_id)
+        self._store.subscribe(self._record)
+        self._search_index = TextIndex(self._store)
+    
+    @property
+    def search_index(self):
+        """Text index over the store (loading the tasks first if they are still on disk)"""
+        if self._store is None:
+            self._load_store()
+        return self._search_index
+    
+    def _record(self, op):
+        if not self._replaying:  # changes read from the journal are not written back
+            self.journal.record(op)
+    
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the data file lock with every change other processes have
+        journaled applied first; all changes are made inside this
+        """
+        with self.journal.lock:
+            ops = self.journal.catch_up() if self._store is not None else None
+            if ops is None:
+                # First use, or another process compacted: (re)load everything
+                self._store = None
+                self._load_store()
+            elif ops:
+                self._replaying = True
+                try:
+                    for op in ops:
+                        self._apply_foreign(op)
+                finally:
+                    self._replaying = False
+            yield
+    
+    def _apply_foreign(self, op):
+        kind = op['op']
+        if kind == 'add':
+            self.store.add(dict(op['task']))
+        elif kind == 'set':
+            if op['id'] in self.store:
+                self.store.update(op['id'], op['fields'])
+        elif kind == 'delete':
+            if op['id'] in self.store:
+                self.store.remove(op['id'])
+        elif kind == 'renumber':
+            self.store.renumber()
+    
+    def refresh(self):
+        """Pick up changes other processes have made since the last look"""
+        if self._store is not None:
+            with self._locked():
+                pass
+    
+    @property
+    def tasks(self):
+        """All tasks in list order (a copy; change tasks through self.store)"""
+        return list(self.store)
+    
+    def load_tasks(self):
+        """Load tasks from the snapshot file plus the journal"""
+        self._store = None
+        # With a binary snapshot and nothing to replay, tasks stay on disk
+        # until a view or a change needs them
+        self._snapshot = self.journal.lazy_snapshot()
+        if self._snapshot is None:
+            self._load_store()
     
     def save_tasks(self):
-        """Save tasks to file"""
+        """Make recorded changes durable (compacts the journal now and then)"""
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump({'tasks': self.tasks}, f, indent=2)
+            if self._store is not None:  # nothing loaded means nothing changed
+                with self._locked():
+                    self.journal.save(self.store)  # only read if it compacts
             print("Saved!")
-        except:
+        except OSError:
             print("Error saving tasks.")
     
+    # ---- programmatic API: no prompts, invalid input raises ValueError ----
+    # Each change runs under the file lock after merging what other
+    # processes have journaled, so concurrent writers never lose updates.
+    # The _*_locked versions expect the lock to be held already (see
+    # apply_batch, which takes it once for many changes).
+    def add(self, title, description="", priority="Medium", category="General", due_date=None):
+        """Add a task and return it; due_date as accepted by parse_due"""
+        with self._locked():
+            return self._add_locked(title, description, priority, category, due_date)
+    
+    def _add_locked(self, title, description="", priority="Medium", category="General", due_date=None):
+        fields = _check_fields({'title': title, 'description': description, 'priority': priority,
+                                'category': category, 'due_date': due_date})
+        return self.store.add({
+            'id': None,  # next never-used id, assigned by the store
+            'title': fields['title'],
+            'description': fields['description'],
+            'priority': priority,
+            'category': fields['category'],
+            'completed': False,
+            'created': datetime.now().strftime("%Y-%m-%d"),
+            'due_date': fields['due_date'],
+            'completed_date': None
+        })
+    
+    def _existing(self, task_id):
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            raise ValueError(f"task id must be a number, not {task_id!r}")
+        task = self.store.get(task_id)
+        if task is None:
+            raise ValueError(f"Task #{task_id} not found")
+        return task
+    
+    def complete(self, task_id):
+        """Mark a task as completed and return it"""
+        with self._locked():
+            return self._complete_locked(task_id)
+    
+    def _complete_locked(self, task_id):
+        task = self._existing(task_id)
+        if task['completed']:
+            raise ValueError(f"Task #{task_id} is already completed")
+        return self.store.update(task_id, {
+            'completed': True,
+            'completed_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    
+    def delete(self, task_id):
+        """Delete a task and return it"""
+        with self._locked():
+            return self._delete_locked(task_id)
+    
+    def _delete_locked(self, task_id):
+        self._existing(task_id)
+        return self.store.remove(task_id)
+    
+    def edit(self, task_id, expected=None, **fields):
+        """
+        Change any of EDITABLE_FIELDS of a task and return it.
+        
+        expected is the task as the caller saw it before deciding on the
+        changes. Fields the caller left as they were are not written, so
+        edits another process made to them in the meantime survive; a
+        field both sides changed to different values raises ConflictError
+        and nothing is changed.
+        """
+        with self._locked():
+            return self._edit_locked(task_id, expected, **fields)
+    
+    def _edit_locked(self, task_id, expected=None, **fields):
+        unknown = set(fields) - set(EDITABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"cannot edit {', '.join(sorted(unknown))}")
+        fields = _check_fields(fields)
+        task = self._existing(task_id)
+        if expected is not None:
+            fields = {f: v for f, v in fields.items() if v != expected.get(f)}
+            conflicts = [f for f, v in fields.items()
+                         if task.get(f) != expected.get(f) and task.get(f) != v]
+            if conflicts:
+                raise ConflictError(f"Task #{task_id} was changed elsewhere "
+                                    f"({', '.join(conflicts)})")
+        return self.store.update(task_id, fields)
+    
+    def clear_completed(self, ids=None):
+        """
+        Remove completed tasks - all of them, or only those among ids -
+        and return how many were removed. Other tasks keep their ids.
+        """
+        with self._locked():
+            return self._clear_completed_locked(ids)
+    
+    def _clear_completed_locked(self, ids=None):
+        completed_ids = [task['id'] for task in self.store.completed()]
+        if ids is not None:
+            ids = set(ids)
+            completed_ids = [task_id for task_id in completed_ids if task_id in ids]
+        for task_id in completed_ids:
+            self.store.remove(task_id)
+        return len(completed_ids)
+    
+    def apply_batch(self, lines, stop_on_error=False):
+        """
+        Apply JSON Lines commands in one pass and save once at the end:
+        
+          {"op": "add", "title": "...", "priority": "High", "due_date": 7}
+          {"op": "complete", "id": 3}
+          {"op": "delete", "id": 3}
+          {"op": "edit", "id": 3, "category": "Work", "due_date": null}
+          {"op": "clear_completed"}
+        
+        The whole batch holds the file lock (other processes' changes are
+        merged once, before the first command), store index maintenance is
+        deferred to the end of it and the journal is flushed once. Returns
+        (applied, errors), errors being (line number, message) pairs for
+        the lines that were skipped; raises OSError if saving fails.
+        """
+        commands = {'add': self._add_locked, 'complete': self._complete_locked,
+                    'delete': self._delete_locked, 'edit': self._edit_locked,
+                    'clear_completed': self._clear_completed_locked}
+        applied, errors = 0, []
+        with self._locked():
+            with self.journal.batch(), self.store.bulk():
+                for n, line in enumerate(lines, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        command = json.loads(line)
+                        if not isinstance(command, dict):
+                            raise ValueError("expected a JSON object")
+                        command = dict(command)
+                        op = command.pop('op', None)
+                        if not isinstance(op, str) or op not in commands:
+                            raise ValueError(f"unknown op {op!r}")
+                        if op in ('complete', 'delete', 'edit'):
+                            commands[op](command.pop('id'), **command)
+                        else:
+                            commands[op](**command)
+                        applied += 1
+                    except (ValueError, TypeError, KeyError) as e:
+                        if isinstance(e, KeyError):
+                            e = f"missing {e}"
+                        errors.append((n, str(e)))
+                        if stop_on_error:
+                            break
+            self.journal.save(self.store)
+        return applied, errors
+    
+    # ---- interactive commands ----
     def add_task(self):
         """Add a new task"""
         title = input("Task: ").strip()
@@ -40,7 +334,7 @@ class SimpleTodoList:
             
             print("Priority levels: High, Medium, Low")
             priority = input("Priority (default: Medium): ").strip() or "Medium"
-            if priority not in ["High", "Medium", "Low"]:
+            if priority not in PRIORITIES:
                 priority = "Medium"
             
             category = input("Category (default: General): ").strip() or "General"
@@ -55,165 +349,107 @@ class SimpleTodoList:
             
             if due_date_input:
                 try:
-                    # Try parsing as number of days
+                    due_date = parse_due(due_date_input)
                     if due_date_input.isdigit():
-                        days = int(due_date_input)
-                        due_date = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
-                        print(f"✓ Due date set to: {due_date} ({days} days from today)")
+                        print(f"✓ Due date set to: {due_date} ({int(due_date_input)} days from today)")
                     else:
-                        # Try parsing as date
-                        datetime.strptime(due_date_input, "%Y-%m-%d")
-                        due_date = due_date_input
                         print(f"✓ Due date set to: {due_date}")
                 except ValueError:
                     print("❌ Invalid date format. Task created without due date.")
             
             # Show creation confirmation
-            creation_date = datetime.now().strftime("%Y-%m-%d")
-            print(f"📅 Task will be created on: {creation_date}")
-            
-            # Generate unique ID by finding the maximum existing ID
-            max_id = max([task['id'] for task in self.tasks], default=0)
-            new_id = max_id + 1
+            print(f"📅 Task will be created on: {datetime.now().strftime('%Y-%m-%d')}")
             
-            task = {
-                'id': new_id,
-                'title': title,
-                'description': description,
-                'priority': priority,
-                'category': category,
-                'completed': False,
-                'created': creation_date,
-                'due_date': due_date,
-                'completed_date': None
-            }
-            self.tasks.append(task)
+            self.add(title, description, priority, category, due_date)
             print(f"Added: {title} (Priority: {priority}, Category: {category})")
     
-    def view_tasks(self, filter_by=None, show_completed=True):
-        """Display tasks with various filters"""
-        if not self.tasks:
+    def view_tasks(self, filter_by=None, show_completed=True, compact=False, offset=0, page_size=None):
+        """
+        Display tasks with various filters, a page at a time starting at
+        task number offset; with more than one page, asks for the next or
+        previous page, a page number, +N/-N to move by N tasks, or c to
+        switch between the full and the compact one-line layout
+        """
+        open_only = not show_completed
+        filter_by = (filter_by or '').lower()
+        today = date.today().toordinal()
+        self.refresh()
+        # Filtered tasks come out of the store's indexes (or, before anything
+        # is loaded, the binary snapshot's due-date index) already sorted by
+        # due date (earliest first), then by priority, then by creation date
+        if (self._store is None and filter_by == 'today' and self._snapshot.is_current()
+                and not self.journal.pending()):
+            if not len(self._snapshot):
+                print("No tasks found.")
+                return
+            filtered_tasks = list(self._snapshot.due_on(today, open_only))  # a few tasks
+        elif not len(self.store):
             print("No tasks found.")
             return
-        
-        # Filter tasks
-        filtered_tasks = self.tasks.copy()
-        
-        if not show_completed:
-            filtered_tasks = [task for task in filtered_tasks if not task['completed']]
-        
-        if filter_by:
-            if filter_by.lower() == 'high':
-                filtered_tasks = [task for task in filtered_tasks if task['priority'] == 'High']
-            elif filter_by.lower() == 'today':
-                today = datetime.now().strftime("%Y-%m-%d")
-                filtered_tasks = [task for task in filtered_tasks if task.get('due_date') == today]
-            elif filter_by.lower() == 'overdue':
-                today = datetime.now().strftime("%Y-%m-%d")
-                filtered_tasks = [task for task in filtered_tasks 
-                                if task.get('due_date') and task.get('due_date') < today and not task['completed']]
+        elif filter_by == 'high':
+            filtered_tasks = self.store.by_priority('High', open_only)
+        elif filter_by == 'today':
+            filtered_tasks = self.store.due_on(today, open_only)
+        elif filter_by == 'overdue':
+            filtered_tasks = self.store.overdue(today)
+        else:
+            filtered_tasks = self.store.ordered(open_only)
         
         if not filtered_tasks:
-            print(f"\nNo tasks found with filter: {filter_by}")
+            print(f"\nNo tasks found with filter: {filter_by or None}")
             return
         
-        # Sort tasks by due date (earliest first), then by priority, then by creation date
-        def sort_key(task):
-            # Handle due dates: None/empty dates go to the end
-            due_date = task.get('due_date')
-            if due_date:
-                due_sort = due_date
+        # Only the tasks on the current page are looked at and formatted
+        page_size = page_size or self.page_size
+        total = len(filtered_tasks)
+        offset = max(0, min(offset, total - 1))
+        renderer = TaskRenderer(today, compact)
+        while True:
+            sys.stdout.write(renderer.page(filtered_tasks, offset, page_size))
+            sys.stdout.flush()
+            if total <= page_size:
+                return
+            choice = input("[Enter] next page, p previous, page number, +N/-N tasks, "
+                           "c compact/full, q back: ").strip().lower()
+            if choice in ('', 'n'):
+                if offset + page_size >= total:
+                    return
+                offset += page_size
+            elif choice == 'p':
+                offset = max(0, offset - page_size)
+            elif choice == 'c':
+                renderer.compact = not renderer.compact
+            elif choice.isdigit():
+                page = min(max(int(choice), 1), -(-total // page_size))
+                offset = (page - 1) * page_size
+            elif choice[:1] in ('+', '-') and choice[1:].isdigit():
+                offset = max(0, min(offset + int(choice), total - 1))
             else:
-                due_sort = '9999-12-31'  # Far future date for tasks without due dates
-            
-            # Priority order (High first)
-            priority_order = {'High': 1, 'Medium': 2, 'Low': 3}
-            priority_sort = priority_order.get(task['priority'], 4)
-            
-            # Creation date for final sorting
-            created_sort = task.get('created', '9999-12-31')
-            
-            return (due_sort, priority_sort, created_sort)
-        
-        filtered_tasks.sort(key=sort_key)
-        
-        print(f"\n{'='*60}")
-        print(f"TO-DO LIST ({len(filtered_tasks)} tasks)")
-        print(f"{'='*60}")
-        
-        for task in filtered_tasks:
-            status = "✓" if task['completed'] else "○"
-            priority_symbol = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}.get(task['priority'], "⚪")
-            
-            print(f"{status} #{task['id']} {priority_symbol} {task['title']}")
-            
-            if task.get('description'):
-                print(f"   📝 {task['description']}")
-            
-            print(f"   📂 Category: {task['category']} | Priority: {task['priority']}")
-            
-            # Display creation date
-            if task.get('created'):
-                created_date = datetime.strptime(task['created'], "%Y-%m-%d")
-                days_ago = (datetime.now() - created_date).days
-                
-                if days_ago == 0:
-                    print(f"   📅 Created: {task['created']} (Today)")
-                elif days_ago == 1:
-                    print(f"   📅 Created: {task['created']} (Yesterday)")
-                else:
-                    print(f"   📅 Created: {task['created']} ({days_ago} days ago)")
-            
-            # Display due date information
-            if task.get('due_date'):
-                due_date = datetime.strptime(task['due_date'], "%Y-%m-%d")
-                days_until = (due_date - datetime.now()).days
-                
-                if days_until < 0:
-                    print(f"   ⏰ Due: {task['due_date']} (OVERDUE by {abs(days_until)} days)")
-                elif days_until == 0:
-                    print(f"   ⏰ Due: {task['due_date']} (TODAY)")
-                elif days_until == 1:
-                    print(f"   ⏰ Due: {task['due_date']} (Tomorrow)")
-                else:
-                    print(f"   ⏰ Due: {task['due_date']} (in {days_until} days)")
-            
-            if task['completed'] and task.get('completed_date'):
-                print(f"   ✅ Completed: {task['completed_date']}")
-            
-            print()
-        print(f"{'='*60}")
+                return
     
     def complete_task(self):
         """Mark a task as completed"""
         try:
             task_id = int(input("Task ID to complete: "))
-            for task in self.tasks:
-                if task['id'] == task_id:
-                    if task['completed']:
-                        print(f"Task #{task_id} is already completed.")
-                    else:
-                        task['completed'] = True
-                        task['completed_date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        print(f"Completed: {task['title']}")
-                    return
-            print("Task not found.")
         except ValueError:
             print("Invalid ID.")
+            return
+        try:
+            print(f"Completed: {self.complete(task_id)['title']}")
+        except ValueError as e:
+            print(f"{e}.")
     
     def delete_task(self):
         """Delete a task"""
         try:
             task_id = int(input("Task ID to delete: "))
-            for i, task in enumerate(self.tasks):
-                if task['id'] == task_id:
-                    title = task['title']
-                    del self.tasks[i]
-                    print(f"Deleted: {title}")
-                    return
-            print("Task not found.")
         except ValueError:
             print("Invalid ID.")
+            return
+        try:
+            print(f"Deleted: {self.delete(task_id)['title']}")
+        except ValueError as e:
+            print(f"{e}.")
     
     def search_tasks(self):
         """Search tasks by title, description, or category"""
@@ -221,25 +457,22 @@ class SimpleTodoList:
         if not search_term:
             return
         
-        matches = []
-        for task in self.tasks:
-            if (search_term in task['title'].lower() or 
-                search_term in task.get('description', '').lower() or 
-                search_term in task.get('category', '').lower()):
-                matches.append(task)
+        # Best matches first (title words beat category and description hits);
+        # a page of them, so a broad term does not rank and print every task
+        self.refresh()
+        total, matches = self.search_index.best(search_term, self.page_size)
         
         if matches:
-            print(f"\nFound {len(matches)} tasks matching '{search_term}':")
-            for task in matches:
-                status = "✓" if task['completed'] else "○"
-                priority_symbol = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}.get(task['priority'], "⚪")
-                print(f"{status} #{task['id']} {priority_symbol} {task['title']} ({task.get('category', 'General')})")
+            shown = f" (best {len(matches)} shown)" if total > len(matches) else ""
+            print(f"\nFound {total} tasks matching '{search_term}'{shown}:")
+            sys.stdout.write("".join(format_line(task) + "\n" for task in matches))
         else:
             print(f"No tasks found matching '{search_term}'")
 
     def clear_completed_tasks(self):
         """Remove all completed tasks"""
-        completed_tasks = [task for task in self.tasks if task['completed']]
+        self.refresh()
+        completed_tasks = list(self.store.completed())
         
         if not completed_tasks:
             print("No completed tasks to clear.")
@@ -252,60 +485,52 @@ class SimpleTodoList:
         confirm = input(f"\nAre you sure you want to delete these {len(completed_tasks)} completed task(s)? (y/N): ").strip().lower()
         
         if confirm == 'y' or confirm == 'yes':
-            self.tasks = [task for task in self.tasks if not task['completed']]
-            print(f"Cleared {len(completed_tasks)} completed task(s).")
-            # Reorganize IDs after clearing
-            self.reorganize_ids()
+            # Only the tasks listed above; ids stay as they are
+            cleared = self.clear_completed([task['id'] for task in completed_tasks])
+            print(f"Cleared {cleared} completed task(s).")
         else:
             print("Clear operation cancelled.")
 
-    def reorganize_ids(self):
-        """Reorganize task IDs to be sequential (1, 2, 3, ...)"""
-        for i, task in enumerate(self.tasks, 1):
-            task['id'] = i
-        print("Task IDs reorganized sequentially.")
-
     def edit_task(self):
         """Edit an existing task"""
         try:
             task_id = int(input("Task ID to edit: "))
-            task_found = None
-            
-            for task in self.tasks:
-                if task['id'] == task_id:
-                    task_found = task
-                    break
-            
-            if not task_found:
+            self.refresh()
+            if task_id not in self.store:
                 print("Task not found.")
                 return
             
+            # Collect the changes; edit() merges them with whatever another
+            # process changed meanwhile, using the task as shown here
+            task_found = self.store.get(task_id)
+            seen = dict(task_found)
+            changes = {}
             print(f"\nEditing task: {task_found['title']}")
             print("Leave blank to keep current value, or enter new value:")
             
             # Edit title
             new_title = input(f"Title [{task_found['title']}]: ").strip()
             if new_title:
-                task_found['title'] = new_title
+                changes['title'] = new_title
             
             # Edit description
             current_desc = task_found.get('description', '')
             new_description = input(f"Description [{current_desc}]: ").strip()
             if new_description or new_description == "":
-                task_found['description'] = new_description
+                changes['description'] = new_description
             
             # Edit priority
             print("Priority levels: High, Medium, Low")
             new_priority = input(f"Priority [{task_found['priority']}]: ").strip()
-            if new_priority and new_priority in ["High", "Medium", "Low"]:
-                task_found['priority'] = new_priority
-            elif new_priority and new_priority not in ["High", "Medium", "Low"]:
+            if new_priority and new_priority in PRIORITIES:
+                changes['priority'] = new_priority
+            elif new_priority and new_priority not in PRIORITIES:
                 print("Invalid priority. Keeping current value.")
             
             # Edit category
             new_category = input(f"Category [{task_found['category']}]: ").strip()
             if new_category:
-                task_found['category'] = new_category
+                changes['category'] = new_category
             
             # Edit due date
             current_due = task_found.get('due_date', 'None')
@@ -313,25 +538,23 @@ class SimpleTodoList:
             due_date_input = input("Due date (YYYY-MM-DD, days from now, or 'clear' to remove): ").strip()
             
             if due_date_input.lower() == 'clear':
-                task_found['due_date'] = None
+                changes['due_date'] = None
                 print("Due date cleared.")
             elif due_date_input:
-                due_date = None
                 try:
-                    # Try parsing as number of days
-                    if due_date_input.isdigit():
-                        days = int(due_date_input)
-                        due_date = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
-                    else:
-                        # Try parsing as date
-                        datetime.strptime(due_date_input, "%Y-%m-%d")
-                        due_date = due_date_input
-                    
-                    task_found['due_date'] = due_date
-                    print(f"Due date updated to: {due_date}")
+                    changes['due_date'] = parse_due(due_date_input)
+                    print(f"Due date updated to: {changes['due_date']}")
                 except ValueError:
                     print("Invalid date format. Keeping current due date.")
             
+            try:
+                self.edit(task_id, seen, **changes)
+            except ConflictError as e:
+                print(f"\n{e}; nothing was changed. Edit it again to see the new values.")
+                return
+            except ValueError as e:
+                print(f"\n{e}.")
+                return
             print(f"\nTask #{task_id} updated successfully!")
             
         except ValueError:
@@ -383,9 +606,28 @@ class SimpleTodoList:
             else:
                 print("Invalid choice.")
 
-def main():
-    todo = SimpleTodoList()
-    todo.run()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simple to-do list")
+    parser.add_argument("--data-file", help="snapshot file (default: todo_data.bin or todo_data.json here)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="apply JSON Lines commands from FILE ('-' for stdin) instead of the menu")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="in batch mode, stop at the first invalid command")
+    args = parser.parse_args(argv)
+    
+    todo = SimpleTodoList(args.data_file)
+    if not args.batch:
+        todo.run()
+        return 0
+    if args.batch == "-":
+        applied, errors = todo.apply_batch(sys.stdin, args.stop_on_error)
+    else:
+        with open(args.batch, encoding="utf-8") as f:
+            applied, errors = todo.apply_batch(f, args.stop_on_error)
+    for n, message in errors:
+        print(f"{args.batch}:{n}: {message}", file=sys.stderr)
+    print(f"Applied {applied} command(s), {len(errors)} error(s).")
+    return 1 if errors else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+Append-only persistence for the to-do list.
+
+State lives in two files next to each other:
+
+  todo_data.json     snapshot, same {"tasks": [...]} format as always,
+                     plus the sequence number of the last change it holds
+                     and the next unused task id
+  todo_data.journal  one JSON line per change, numbered by "seq"
+
+or todo_data.bin instead of todo_data.json: the same tasks in the
+memory-mapped binary format of todo_snapshot.py.
+
+Each add/edit/complete/delete is appended to the journal as it happens,
+so a save only writes what changed. Once the journal grows past
+compact_every entries it is folded into a new snapshot, written to a
+temp file and renamed over the old one so a crash can never leave a
+half-written snapshot behind. Startup loads the snapshot and replays the
+journal entries newer than the snapshot on top of it, so a crash between
+writing a snapshot and clearing the journal does not apply changes twice.
+
+Several processes can share the files. Every write happens under the
+lock in todo_data.lock (todo_lock.py), and a writer first calls
+catch_up() to read the entries other processes appended since it last
+looked, so "seq" numbers stay in one global order and each process
+merges the others' changes instead of overwriting them. A snapshot
+replaced by another process's compaction is noticed by catch_up(),
+which then asks for a full load().
+
+Journal entries (each also carries "seq"):
+  {"op": "add", "task": {...}}
+  {"op": "set", "id": 3, "fields": {"completed": true, ...}}
+  {"op": "delete", "id": 3}
+  {"op": "renumber"}             # ids became 1..n in list order (only
+                                 # written by versions that renumbered)
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from todo_lock import FileLock
+from todo_model import Task, json_default
+from todo_snapshot import BinarySnapshot, read_snapshot, write_snapshot
+
+
+class JournalError(Exception):
+    """The snapshot or journal could not be read."""
+
+
+def apply_op(tasks: Dict[int, Dict], op: Dict) -> Dict[int, Dict]:
+    """
+    Apply one journal entry to tasks (a dict by id, in list order).
+    Returns the dict to use from now on (renumbering builds a new one).
+    """
+    kind = op["op"]
+    if kind == "add":
+        tasks[op["task"]["id"]] = dict(op["task"])
+    elif kind == "set":
+        if op["id"] in tasks:
+            tasks[op["id"]].update(op["fields"])
+    elif kind == "delete":
+        tasks.pop(op["id"], None)
+    elif kind == "renumber":
+        renumbered = {}
+        for i, task in enumerate(tasks.values(), 1):
+            task["id"] = i
+            renumbered[i] = task
+        return renumbered
+    else:
+        raise JournalError(f"unknown journal op {kind!r}")
+    return tasks
+
+
+def _file_id(path: str, with_content: bool = False) -> Optional[tuple]:
+    """Identity of the file at path (None if missing); with_content also notices rewrites."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if with_content:
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    return (st.st_dev, st.st_ino)
+
+
+class TaskJournal:
+    def __init__(self, snapshot_path: str, journal_path: str = None, compact_every: int = 1000):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".journal"
+        self.compact_every = compact_every
+        self.binary = snapshot_path.endswith(".bin")
+        self.lock = FileLock(os.path.splitext(snapshot_path)[0] + ".lock")
+        self.entries = 0  # journal entries on top of the snapshot
+        self.seq = 0      # sequence number of the last change recorded
+        self.next_id = 1  # lowest task id never handed out; ids are not reused
+        self._fh = None
+        self._batched = False
+        self._offset = 0              # bytes of the journal this process has seen
+        self._journal_id = None       # which journal file those bytes belong to
+        self._snapshot_id = None      # the snapshot file the state was loaded from
+
+    # ---- reading ----
+    def load(self) -> List[Dict]:
+        """Snapshot plus every journal entry after it."""
+        with self.lock:
+            self.close()
+            self._snapshot_id = _file_id(self.snapshot_path, with_content=True)
+            snapshot, self.seq, self.next_id = self._read_snapshot()
+            tasks = {task["id"]: task for task in snapshot}
+            self.entries = 0
+            self._journal_id, self._offset = _file_id(self.journal_path), 0
+            for op in self._read_new():
+                tasks = apply_op(tasks, op)
+        self.next_id = max(self.next_id, max(tasks, default=0) + 1)
+        return list(tasks.values())
+
+    def catch_up(self) -> Optional[List[Dict]]:
+        """
+        Entries other processes appended since this one last read or wrote
+        the journal, in order; call with the lock held. Returns None when
+        another process compacted in the meantime - load() again then.
+        """
+        if _file_id(self.snapshot_path, with_content=True) != self._snapshot_id:
+            return None
+        journal_id = _file_id(self.journal_path)
+        if journal_id != self._journal_id:
+            # A journal started (or restarted) since we last looked
+            self.close()
+            self._journal_id, self._offset = journal_id, 0
+        return self._read_new()
+
+    def _read_new(self) -> List[Dict]:
+        """Entries past self._offset newer than self.seq (lock held); advances both."""
+        if self._journal_id is None:
+            return []
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        ops = []
+        pos = self._offset
+        lines = data.split(b"\n")
+        for n, line in enumerate(lines):
+            end = pos + len(line) + 1
+            try:
+                if n == len(lines) - 1:
+                    if line.strip():
+                        raise ValueError("no line terminator")
+                    break
+                op = json.loads(line) if line.strip() else None
+            except ValueError:
+                if not any(rest.strip() for rest in lines[n + 1:]):
+                    # torn final write from a crash; everything before it is intact
+                    print(f"Warning: ignoring incomplete last entry in {self.journal_path}")
+                    self._truncate_to(pos)
+                    break
+                raise JournalError(f"{self.journal_path}: unreadable journal entry at byte {pos}")
+            pos = end
+            if op is None or op.get("seq", 0) <= self.seq:
+                continue  # blank, or already folded into the snapshot
+            ops.append(op)
+            self.seq = op["seq"]
+            self.entries += 1
+            if op["op"] == "add":
+                self.next_id = max(self.next_id, op["task"]["id"] + 1)
+        self._offset = pos
+        return ops
+
+    def _read_snapshot(self) -> tuple:
+        """(tasks, journal_seq, next_id) from the snapshot file."""
+        if not os.path.exists(self.snapshot_path):
+            return [], 0, 1
+        try:
+            if self.binary:
+                return read_snapshot(self.snapshot_path)
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("tasks", []), data.get("journal_seq", 0), data.get("next_id", 1)
+        except (ValueError, AttributeError) as e:
+            # Keep the damaged file for inspection instead of overwriting it later
+            aside = f"{self.snapshot_path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+            os.replace(self.snapshot_path, aside)
+            print(f"Warning: {self.snapshot_path} is damaged ({e}); moved it to {aside}")
+            self._snapshot_id = None
+            return [], 0, 1
+
+    def pending(self) -> bool:
+        """Whether the journal holds any entries at all."""
+        return os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > 0
+
+    def lazy_snapshot(self) -> Optional[BinarySnapshot]:
+        """
+        The binary snapshot, mapped but not decoded, when it already holds
+        every change (no journal to replay); otherwise None and load() is needed.
+        """
+        if not self.binary or self.pending() or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            snap = BinarySnapshot(self.snapshot_path)
+        except (OSError, ValueError):
+            return None  # load() reports it and moves the file aside
+        self.seq = snap.journal_seq
+        self.entries = 0
+        return snap
+
+    def _truncate_to(self, size: int) -> None:
+        with open(self.journal_path, "r+b") as f:
+            f.truncate(size)
+
+    # ---- writing (all with self.lock held) ----
+    def record(self, op: Dict) -> None:
+        """Append one change to the journal (buffered by the OS until sync())."""
+        if not self.lock.held:
+            raise JournalError("journal writes need the lock; catch_up() under journal.lock first")
+        if self._fh is None:
+            self._fh = open(self.journal_path, "ab")
+            self._journal_id = _file_id(self.journal_path)
+        self.seq += 1
+        line = (json.dumps(dict(op, seq=self.seq), separators=(",", ":"), default=json_default)
+                + "\n").encode("utf-8")
+        self._fh.write(line)
+        self._offset += len(line)
+        if not self._batched:
+            self._fh.flush()
+        self.entries += 1
+        if op["op"] == "add":
+            self.next_id = max(self.next_id, op["task"]["id"] + 1)
+
+    @contextmanager
+    def batch(self):
+        """Record many changes with one flush at the end instead of one per change."""
+        self._batched = True
+        try:
+            yield self
+        finally:
+            self._batched = False
+            if self._fh is not None:
+                self._fh.flush()
+
+    def sync(self) -> None:
+        """Make every recorded change durable."""
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def save(self, tasks: Iterable[Dict]) -> None:
+        """Commit recorded changes; compact once the journal is long enough."""
+        with self.lock:
+            self.sync()
+            if self.entries >= self.compact_every:
+                self.compact(tasks)
+
+    def compact(self, tasks: Iterable[Dict]) -> None:
+        """
+        Write tasks as the new snapshot (atomically) and start an empty
+        journal. tasks must include every change in the journal (catch_up() first).
+        """
+        with self.lock:
+            if self.binary:
+                write_snapshot(self.snapshot_path, tasks, self.seq, self.next_id)
+            else:
+                tmp = self.snapshot_path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"tasks": [json_default(task) if isinstance(task, Task) else task
+                                         for task in tasks],
+                               "journal_seq": self.seq, "next_id": self.next_id}, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.snapshot_path)
+            # The snapshot now holds every change; only then drop the journal
+            self.close()
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.entries = 0
+            self._journal_id, self._offset = None, 0
+            self._snapshot_id = _file_id(self.snapshot_path, with_content=True)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
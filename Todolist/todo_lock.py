@@ -0,0 +1,90 @@
+"""
+Cross-process lock for the to-do data files.
+
+An exclusive advisory lock on a small side file (todo_data.lock):
+fcntl.flock on Unix, msvcrt.locking on Windows. Every process that
+writes the journal or the snapshot holds it for the duration of the
+write, so appends never interleave and a compaction never races an
+append. The lock is re-entrant within a process (and thread-safe), so a
+batch can hold it across many individual changes.
+"""
+
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _lock(fh) -> None:
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        return
+    fh.seek(0)
+    while True:
+        try:
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue  # LK_LOCK gives up after ~10s; keep waiting
+
+
+def _unlock(fh) -> None:
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+    else:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()
+
+    @property
+    def held(self) -> bool:
+        """Whether the current thread holds the lock."""
+        if not self._thread_lock.acquire(blocking=False):
+            return False
+        try:
+            return self._depth > 0
+        finally:
+            self._thread_lock.release()
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fh = open(self.path, "a+b")
+                try:
+                    _lock(fh)
+                except BaseException:
+                    fh.close()
+                    raise
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fh = fh
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                _unlock(self._fh)
+            finally:
+                self._fh.close()
+                self._fh = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,265 @@
+"""
+Compact in-memory representation of a to-do task.
+
+A task used to be a plain dict with nine string keys and its dates as
+strings. Task keeps the same fields in __slots__ instead (no per-task
+dict or key strings), interns the category and priority so every task
+shares one copy of "General"/"Medium", and stores dates as integers:
+
+  created, due_date   date ordinal (date.toordinal())
+  completed_date      seconds since 0001-01-01 00:00:00
+
+so views can do date arithmetic without parsing strings. Task is still a
+mapping with the todo_data.json keys - task['due_date'] gives back
+'2025-10-01' - so existing code and the journal keep working, and
+to_dict()/from_dict() round-trip the JSON schema exactly: key order,
+missing keys, unknown keys and date strings in an unexpected format are
+all preserved.
+
+  python todo_model.py [N]   # measure bytes per task, dict vs Task
+"""
+
+import sys
+from collections.abc import MutableMapping
+from datetime import date
+from typing import Any, Dict, Iterator, Optional
+
+FIELDS = ('id', 'title', 'description', 'priority', 'category',
+          'completed', 'created', 'due_date', 'completed_date')
+_MISSING = object()  # slot value for a key the task's JSON did not have
+_DAY = 86400
+
+
+class _Raw:
+    """An int found in a date field of the JSON, kept apart from real ordinals."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _digits(text: str) -> bool:
+    return text.isascii() and text.isdigit()
+
+
+def parse_day(value):
+    """'2025-10-01' -> ordinal; None stays None, anything else is kept as is."""
+    if (isinstance(value, str) and len(value) == 10 and value[4] == value[7] == '-'
+            and _digits(value[:4] + value[5:7] + value[8:])):
+        try:
+            return date(int(value[:4]), int(value[5:7]), int(value[8:])).toordinal()
+        except ValueError:
+            pass
+    return _Raw(value) if type(value) is int else value
+
+
+def day_ordinal(value) -> int:
+    """A YYYY-MM-DD string or a day ordinal, as an ordinal (for query bounds)."""
+    if type(value) is int:
+        return value
+    day = parse_day(value)
+    if type(day) is not int:
+        raise ValueError(f"not a YYYY-MM-DD date: {value!r}")
+    return day
+
+
+def format_day(value):
+    if type(value) is int:
+        return date.fromordinal(value).isoformat()
+    return value.value if type(value) is _Raw else value
+
+
+def parse_stamp(value):
+    """'2025-10-01 14:03:09' -> seconds since year 1; other values kept as is."""
+    if (isinstance(value, str) and len(value) == 19 and value[10] == ' '
+            and value[13] == value[16] == ':' and _digits(value[11:13] + value[14:16] + value[17:])):
+        day = parse_day(value[:10])
+        hour, minute, second = int(value[11:13]), int(value[14:16]), int(value[17:])
+        if type(day) is int and hour < 24 and minute < 60 and second < 60:
+            return day * _DAY + hour * 3600 + minute * 60 + second
+    return _Raw(value) if type(value) is int else value
+
+
+def format_stamp(value):
+    if type(value) is not int:
+        return value.value if type(value) is _Raw else value
+    day, secs = divmod(value, _DAY)
+    return (f"{date.fromordinal(day).isoformat()} "
+            f"{secs // 3600:02d}:{secs // 60 % 60:02d}:{secs % 60:02d}")
+
+
+_PARSE = {'created': parse_day, 'due_date': parse_day, 'completed_date': parse_stamp}
+_FORMAT = {'created': format_day, 'due_date': format_day, 'completed_date': format_stamp}
+_INTERN = ('priority', 'category')
+
+
+class Task(MutableMapping):
+    __slots__ = FIELDS + ('_order', '_extra')
+
+    def __init__(self, **fields):
+        for name in FIELDS:
+            setattr(self, name, _MISSING)
+        self._order = None  # key order, when it differs from FIELDS
+        self._extra = None  # keys outside the schema, in a dict
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        if tuple(data) == FIELDS:
+            # The usual shape: fill the slots directly (this runs per task on load)
+            task = cls.__new__(cls)
+            task.id = data['id']
+            task.title = data['title']
+            task.description = data['description']
+            priority, category = data['priority'], data['category']
+            task.priority = sys.intern(priority) if isinstance(priority, str) else priority
+            task.category = sys.intern(category) if isinstance(category, str) else category
+            task.completed = data['completed']
+            task.created = parse_day(data['created'])
+            task.due_date = parse_day(data['due_date'])
+            task.completed_date = parse_stamp(data['completed_date'])
+            task._order = task._extra = None
+            return task
+        task = cls(**data)
+        keys = list(data)
+        if keys != list(task):
+            task._order = tuple(keys)
+        return task
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._order is None and self._extra is None:
+            values = (self.id, self.title, self.description, self.priority, self.category,
+                      self.completed, self.created, self.due_date, self.completed_date)
+            if _MISSING not in values:
+                return dict(zip(FIELDS, values[:6] + (format_day(self.created),
+                                                      format_day(self.due_date),
+                                                      format_stamp(self.completed_date))))
+        return {key: self[key] for key in self}
+
+    # ---- mapping protocol ----
+    def __getitem__(self, key: str) -> Any:
+        if key in _FORMAT:
+            value = getattr(self, key)
+            if value is _MISSING:
+                raise KeyError(key)
+            return _FORMAT[key](value)
+        if key in FIELDS:
+            value = getattr(self, key)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in FIELDS:
+            if key in _PARSE:
+                value = _PARSE[key](value)
+            elif key in _INTERN and isinstance(value, str):
+                value = sys.intern(value)
+            if self._order is not None and getattr(self, key) is _MISSING:
+                self._order += (key,)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            if self._order is not None and key not in self._extra:
+                self._order += (key,)
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in FIELDS:
+            if getattr(self, key) is _MISSING:
+                raise KeyError(key)
+            setattr(self, key, _MISSING)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+        if self._order is not None:
+            self._order = tuple(k for k in self._order if k != key)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._order is not None:
+            return iter(self._order)
+        keys = [name for name in FIELDS if getattr(self, name) is not _MISSING]
+        if self._extra:
+            keys += list(self._extra)
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key) -> bool:
+        if key in FIELDS:
+            return getattr(self, key) is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def __repr__(self) -> str:
+        return f"Task({self.to_dict()!r})"
+
+    # ---- dates as day ordinals (None when unset or not a YYYY-MM-DD date) ----
+    @property
+    def created_day(self) -> Optional[int]:
+        return self.created if type(self.created) is int else None
+
+    @property
+    def due_day(self) -> Optional[int]:
+        return self.due_date if type(self.due_date) is int else None
+
+
+def as_task(data) -> Task:
+    return data if isinstance(data, Task) else Task.from_dict(data)
+
+
+def json_default(obj):
+    """default= hook for json.dump(s): a Task is written as its todo_data.json dict."""
+    if isinstance(obj, Task):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def measure_memory(n: int = 100_000) -> Dict[str, float]:
+    """Bytes per task for n sample tasks held as dicts and as Task objects."""
+    import random
+    import tracemalloc
+
+    rng = random.Random(0)
+    categories = ["General", "Work", "Home", "Shopping", "Health"]
+    base = date(2025, 1, 1).toordinal()
+
+    def sample(i):
+        created = base + rng.randrange(365)
+        done = rng.random() < 0.3
+        return {
+            'id': i,
+            'title': f"Task number {i}",
+            'description': "" if i % 3 else f"Details for task {i}",
+            # built fresh, like json.load does, so nothing is shared by accident
+            'priority': "".join(rng.choice(["High", "Medium", "Low"])),
+            'category': "".join(rng.choice(categories)),
+            'completed': done,
+            'created': date.fromordinal(created).isoformat(),
+            'due_date': date.fromordinal(created + rng.randrange(60)).isoformat() if i % 4 else None,
+            'completed_date': f"{date.fromordinal(created + 1).isoformat()} 12:00:00" if done else None,
+        }
+
+    result = {}
+    for label, build in (("dict", sample), ("Task", lambda i: Task.from_dict(sample(i)))):
+        tracemalloc.start()
+        tasks = [build(i) for i in range(n)]
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        result[label] = current / n
+        del tasks
+    result["saved_pct"] = 100 * (1 - result["Task"] / result["dict"])
+    return result
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    m = measure_memory(n)
+    print(f"{n:,} tasks: dict {m['dict']:.0f} B/task, Task {m['Task']:.0f} B/task "
+          f"({m['saved_pct']:.0f}% less)")
@@ -0,0 +1,241 @@
+"""
+Due-date reminders for the to-do list.
+
+ReminderScheduler keeps every open task with a due date in a heap of
+upcoming notifications:
+
+  DUE TODAY  at the start of the due day
+  OVERDUE    at the start of the day after it
+
+A background thread sleeps on a Condition until the earliest one is
+due, so an idle scheduler uses no CPU at all; it does not poll. The
+scheduler subscribes to a TaskStore, so adding, editing, completing or
+deleting a task only pushes that task's new entries (or forgets its old
+ones) and wakes the thread if the next wake-up moved. Entries made stale
+by a change stay in the heap and are skipped when they come up, using a
+per-task generation number. A task is notified at most once per
+(kind, due date), so editing its title does not repeat a reminder (nor
+does renumbering the ids or reloading the store).
+
+Tasks already due today or overdue are reported as soon as the
+scheduler starts. Notifications go to a sink - stdout, or a file that
+each line is appended to:
+
+  python todo_reminders.py                     # todo_data.json/.bin next to this file
+  python todo_reminders.py --out reminders.log --refresh 30
+
+Changes made by other processes (the app, a batch) reach the store
+through the shared journal; the service catches up with it every
+--refresh seconds, which is only a stat() when nothing changed.
+"""
+
+import argparse
+import heapq
+import itertools
+import sys
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from todo_model import Task
+from todo_render import format_line
+from todo_store import TaskStore
+
+DUE_TODAY = "DUE TODAY"
+OVERDUE = "OVERDUE"
+
+
+def day_start(day: int) -> float:
+    """Local midnight at the start of a day ordinal, as a time.time() value."""
+    return datetime.combine(date.fromordinal(day), datetime.min.time()).timestamp()
+
+
+def stdout_sink(message: str) -> None:
+    print(message, flush=True)
+
+
+class FileSink:
+    """Appends each notification to a file, flushed as it is written."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def __call__(self, message: str) -> None:
+        self._fh.write(message + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class ReminderScheduler:
+    def __init__(self, store: TaskStore, sink: Callable[[str], None] = stdout_sink,
+                 clock: Callable[[], float] = time.time):
+        self.sink = sink
+        self.clock = clock
+        self.store = None
+        self._cond = threading.Condition()
+        # (when, tie-breaker, task id, kind, due day, generation)
+        self._heap: List[Tuple[float, int, int, str, int, int]] = []
+        self._generation: Dict[int, int] = {}  # task id -> generation of its live entries
+        # task id -> (task, {(kind, due day)} already notified); the task is
+        # kept so the entry can follow it when ids are renumbered
+        self._sent: Dict[int, Tuple[Task, Set[Tuple[str, int]]]] = {}
+        self._counter = itertools.count()
+        self._thread = None
+        self._stopped = False
+        self.attach(store)
+
+    # ---- queue maintenance ----
+    def attach(self, store: TaskStore) -> None:
+        """Follow store from now on (e.g. after the app reloaded its tasks); rebuilds the queue."""
+        with self._cond:
+            if store is not self.store:
+                if self.store is not None:
+                    self.store.unsubscribe(self._on_change)
+                store.subscribe(self._on_change)
+                # What was sent carries over to the same task ids in the new store
+                self._sent = {task_id: (store.get(task_id), sent)
+                              for task_id, (_task, sent) in self._sent.items() if task_id in store}
+            self.store = store
+            self._heap = []
+            self._generation.clear()
+            for task in store:
+                self._schedule(task, heapify=False)
+            heapq.heapify(self._heap)
+            self._cond.notify()
+
+    def _schedule(self, task, heapify: bool = True) -> None:
+        """Replace task's entries with ones for its current state (lock held)."""
+        task_id = task['id']
+        generation = self._generation.get(task_id, 0) + 1
+        self._generation[task_id] = generation
+        due = task.due_day
+        if due is None or task['completed']:
+            return
+        now = self.clock()
+        entries = []
+        if due >= self._today(now):
+            entries.append((max(now, day_start(due)), DUE_TODAY))
+        entries.append((max(now, day_start(due + 1)), OVERDUE))
+        for when, kind in entries:
+            entry = (when, next(self._counter), task_id, kind, due, generation)
+            if heapify:
+                heapq.heappush(self._heap, entry)
+            else:
+                self._heap.append(entry)
+
+    def _on_change(self, op: Dict) -> None:
+        if self.store is None:
+            return
+        with self._cond:
+            kind = op['op']
+            if kind == 'add':
+                self._schedule(op['task'])
+            elif kind == 'set':
+                if 'due_date' not in op['fields'] and 'completed' not in op['fields']:
+                    return
+                task = self.store.get(op['id'])
+                if task is not None:
+                    self._schedule(task)
+            elif kind == 'delete':
+                self._generation.pop(op['id'], None)
+                self._sent.pop(op['id'], None)
+            elif kind == 'renumber':
+                # The same task objects now carry new ids
+                self._sent = {task['id']: (task, sent) for task, sent in self._sent.values()}
+                self.attach(self.store)
+                return
+            self._cond.notify()
+
+    # ---- firing ----
+    def _today(self, now: float) -> int:
+        return date.fromtimestamp(now).toordinal()
+
+    def run_pending(self) -> Optional[float]:
+        """Send every notification that is due; returns when the next one is (None: nothing queued)."""
+        with self._cond:
+            now = self.clock()
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                _when, _n, task_id, kind, due, generation = heapq.heappop(heap)
+                if self._generation.get(task_id) != generation:
+                    continue  # the task changed or went away since this was queued
+                task = self.store.get(task_id)
+                if task is None:
+                    continue
+                sent = self._sent.setdefault(task_id, (task, set()))[1]
+                if (kind, due) in sent:
+                    continue
+                sent.add((kind, due))
+                self.sink(self.format(kind, task, now))
+            return heap[0][0] if heap else None
+
+    def format(self, kind: str, task, now: float) -> str:
+        stamp = datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+        return f"{stamp} {kind:<9} {format_line(task)} - due {task['due_date']}"
+
+    def agenda(self, today: int = None) -> Dict[str, List]:
+        """Open tasks that are overdue or due today, from the store's indexes."""
+        today = self._today(self.clock()) if today is None else today
+        return {OVERDUE: list(self.store.overdue(today)),
+                DUE_TODAY: list(self.store.due_on(today, open_only=True))}
+
+    # ---- the background thread ----
+    def _run(self) -> None:
+        with self._cond:
+            while not self._stopped:
+                upcoming = self.run_pending()
+                timeout = None if upcoming is None else max(0.0, upcoming - self.clock())
+                self._cond.wait(timeout)
+
+    def start(self) -> "ReminderScheduler":
+        with self._cond:
+            self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="todo-reminders", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main(argv: List[str] = None) -> int:
+    from priority_to_do_list import SimpleTodoList
+
+    parser = argparse.ArgumentParser(description="Print reminders for due and overdue tasks")
+    parser.add_argument("--data-file", help="snapshot file (default: todo_data.bin or todo_data.json here)")
+    parser.add_argument("--out", metavar="FILE", help="append reminders to FILE instead of printing them")
+    parser.add_argument("--refresh", type=float, default=60.0,
+                        help="seconds between checks for changes from other processes (0: never)")
+    args = parser.parse_args(argv)
+
+    todo = SimpleTodoList(args.data_file)
+    sink = FileSink(args.out) if args.out else stdout_sink
+    scheduler = ReminderScheduler(todo.store, sink).start()
+    try:
+        if args.refresh <= 0:
+            threading.Event().wait()  # until Ctrl+C
+        while True:
+            time.sleep(args.refresh)
+            todo.refresh()
+            if todo.store is not scheduler.store:  # another process compacted: a new store
+                scheduler.attach(todo.store)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+        if args.out:
+            sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Text rendering for the to-do list views.
+
+TaskRenderer formats one page of an already filtered and sorted task
+sequence (a TaskRange from the store, or a list) into a single string,
+so a page is one write to the terminal instead of several print calls
+per task. Only the tasks on the page are touched. "Today" is fixed when
+the renderer is created, and the date labels ("Yesterday", "in 3 days",
+...) are computed once per distinct day and reused across the page.
+
+Two layouts: the full multi-line block view_tasks has always printed,
+and a compact one line per task in the search_tasks format.
+"""
+
+from datetime import date
+from typing import Dict, List, Sequence
+
+PRIORITY_SYMBOLS = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}
+RULE = "=" * 60
+
+
+def format_line(task) -> str:
+    """One-line summary: status, id, priority symbol, title and category."""
+    status = "✓" if task['completed'] else "○"
+    symbol = PRIORITY_SYMBOLS.get(task['priority'], "⚪")
+    return f"{status} #{task['id']} {symbol} {task['title']} ({task.get('category', 'General')})"
+
+
+class TaskRenderer:
+    def __init__(self, today: int = None, compact: bool = False):
+        """today: day ordinal the relative dates are computed against (default: today)."""
+        self.today = date.today().toordinal() if today is None else today
+        self.compact = compact
+        self._created: Dict[int, str] = {}
+        self._due: Dict[int, str] = {}
+
+    def _created_label(self, day: int) -> str:
+        label = self._created.get(day)
+        if label is None:
+            days_ago = self.today - day
+            text = date.fromordinal(day).isoformat()
+            if days_ago == 0:
+                label = f"   📅 Created: {text} (Today)"
+            elif days_ago == 1:
+                label = f"   📅 Created: {text} (Yesterday)"
+            else:
+                label = f"   📅 Created: {text} ({days_ago} days ago)"
+            self._created[day] = label
+        return label
+
+    def _due_label(self, day: int) -> str:
+        label = self._due.get(day)
+        if label is None:
+            days_until = day - self.today
+            text = date.fromordinal(day).isoformat()
+            if days_until < 0:
+                label = f"   ⏰ Due: {text} (OVERDUE by {abs(days_until)} days)"
+            elif days_until == 0:
+                label = f"   ⏰ Due: {text} (TODAY)"
+            elif days_until == 1:
+                label = f"   ⏰ Due: {text} (Tomorrow)"
+            else:
+                label = f"   ⏰ Due: {text} (in {days_until} days)"
+            self._due[day] = label
+        return label
+
+    def task_lines(self, task, out: List[str]) -> None:
+        """Append the full multi-line block for task to out."""
+        status = "✓" if task['completed'] else "○"
+        symbol = PRIORITY_SYMBOLS.get(task['priority'], "⚪")
+        out.append(f"{status} #{task['id']} {symbol} {task['title']}")
+        if task.get('description'):
+            out.append(f"   📝 {task['description']}")
+        out.append(f"   📂 Category: {task['category']} | Priority: {task['priority']}")
+        if task.created_day is not None:
+            out.append(self._created_label(task.created_day))
+        if task.due_day is not None:
+            out.append(self._due_label(task.due_day))
+        if task['completed'] and task.get('completed_date'):
+            out.append(f"   ✅ Completed: {task['completed_date']}")
+        out.append("")
+
+    def page(self, tasks: Sequence, offset: int = 0, page_size: int = None) -> str:
+        """The view for tasks[offset:offset + page_size] (everything if page_size is None)."""
+        total = len(tasks)
+        end = total if page_size is None else min(total, offset + page_size)
+        heading = f"TO-DO LIST ({total} tasks)"
+        if offset or end < total:
+            pages = -(-total // page_size)
+            heading += f" - showing {offset + 1}-{end}, page {offset // page_size + 1} of {pages}"
+        out = ["", RULE, heading, RULE]
+        if self.compact:
+            out.extend(format_line(task) for task in tasks[offset:end])
+        else:
+            for task in tasks[offset:end]:
+                self.task_lines(task, out)
+        out.append(RULE)
+        return "\n".join(out) + "\n"
@@ -0,0 +1,286 @@
+"""
+Full-text search index for the to-do list.
+
+Each task's title, description and category are lowercased once, when
+the task is added or edited, and indexed two ways:
+
+  trigrams  every 3-character substring -> ids of the tasks containing it
+  tokens    every word -> ids, plus a sorted word list for prefix lookups
+
+Postings are sorted arrays of 32-bit ids rather than sets, a few bytes
+per entry instead of a hash slot and an int object. A substring query
+walks the shortest posting, keeps the ids found (by bisection) in the
+others and only checks the few surviving candidates with a real
+substring test, so a search touches the tasks that can match instead of
+every task. Queries shorter than three characters have no trigram and
+fall back to scanning the pre-lowercased text. The index subscribes to a
+TaskStore and follows its add/set/delete/renumber ops, so it never has
+to be rebuilt by hand. The index is built on the first query rather than
+at startup, so opening a large list to add one task stays fast.
+
+Ranking (ranked=True) puts whole-word title matches first, then word
+prefixes, then plain substring matches; the title counts more than the
+category, which counts more than the description. Ties keep view order.
+Scores come from the lowercased text kept for each task, with two
+patterns compiled once per query, and only the best matches are sorted.
+"""
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from todo_store import TaskStore, sort_key
+
+FIELDS = ('title', 'category', 'description')
+FIELD_WEIGHT = {'title': 4, 'category': 2, 'description': 1}
+_WEIGHTS = tuple(FIELD_WEIGHT[field] for field in FIELDS)
+_SEP = '\x00'  # between fields, so no trigram spans two of them
+_WORD = re.compile(r'\w+')
+
+
+def _text(task: Dict) -> str:
+    return _SEP.join((task.get(field) or '').lower() for field in FIELDS)
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _postings() -> array:
+    return array('I')
+
+
+def _insert(ids: array, task_id: int) -> None:
+    if not ids or ids[-1] < task_id:
+        ids.append(task_id)  # the usual case: ids only grow
+        return
+    i = bisect_left(ids, task_id)
+    if i == len(ids) or ids[i] != task_id:
+        ids.insert(i, task_id)
+
+
+def _remove(ids: array, task_id: int) -> None:
+    i = bisect_left(ids, task_id)
+    if i < len(ids) and ids[i] == task_id:
+        del ids[i]
+
+
+def _contains(ids: array, task_id: int) -> bool:
+    i = bisect_left(ids, task_id)
+    return i < len(ids) and ids[i] == task_id
+
+
+class _Scorer:
+    """The relevance of indexed texts for one lowercased query."""
+
+    def __init__(self, query: str):
+        self.query = query
+        if _WORD.fullmatch(query):
+            # The query as a whole word / as the start of a word, i.e. what
+            # comparing it with every word of the field would find
+            self.word = re.compile(r'(?<!\w)' + re.escape(query) + r'(?!\w)').search
+            self.prefix = re.compile(r'(?<!\w)' + re.escape(query)).search
+        else:
+            self.word = self.prefix = None  # no word can equal or start with it
+
+    def __call__(self, text: str) -> int:
+        query = self.query
+        total = 0
+        for value, weight in zip(text.split(_SEP), _WEIGHTS):
+            if query not in value:
+                continue
+            if value == query or (self.word and self.word(value)):
+                total += 3 * weight
+            elif self.prefix and self.prefix(value):
+                total += 2 * weight
+            else:
+                total += weight
+        return total
+
+
+class TextIndex:
+    def __init__(self, store: TaskStore):
+        self.store = store
+        self._text: Dict[int, str] = {}
+        self._grams: Dict[str, array] = defaultdict(_postings)
+        self._tokens: Dict[str, array] = defaultdict(_postings)
+        self._vocab: List[str] = []  # sorted keys of _tokens
+        self._built = False
+        store.subscribe(self._on_change)
+
+    # ---- maintenance ----
+    def _build(self) -> None:
+        self._built = True
+        self._text.clear()
+        self._grams.clear()
+        self._tokens.clear()
+        text, grams, tokens = self._text, self._grams, self._tokens
+        findall = _WORD.findall
+        # In id order, so every posting is built by appending
+        for task in sorted(self.store, key=lambda task: task['id']):
+            task_id = task['id']
+            text[task_id] = value = _text(task)
+            for gram in {value[i:i + 3] for i in range(len(value) - 2)}:
+                if _SEP not in gram:
+                    grams[gram].append(task_id)
+            for word in set(findall(value)):
+                tokens[word].append(task_id)
+        self._vocab = sorted(tokens)
+
+    def _index(self, task_id: int, text: str) -> None:
+        self._text[task_id] = text
+        grams = self._grams
+        for gram in _trigrams(text):
+            if _SEP not in gram:
+                _insert(grams[gram], task_id)
+        for word in set(_WORD.findall(text)):
+            ids = self._tokens[word]
+            if not ids:
+                insort(self._vocab, word)
+            _insert(ids, task_id)
+
+    def _unindex(self, task_id: int) -> None:
+        text = self._text.pop(task_id, None)
+        if text is None:
+            return
+        for gram in _trigrams(text):
+            ids = self._grams.get(gram)
+            if ids is not None:
+                _remove(ids, task_id)
+                if not ids:
+                    del self._grams[gram]
+        for word in set(_WORD.findall(text)):
+            ids = self._tokens[word]
+            _remove(ids, task_id)
+            if not ids:
+                del self._tokens[word]
+                del self._vocab[bisect_left(self._vocab, word)]
+
+    def invalidate(self) -> None:
+        """Drop the index; it is rebuilt by the next query."""
+        self._built = False
+        self._text.clear()
+        self._grams.clear()
+        self._tokens.clear()
+        self._vocab = []
+
+    def _on_change(self, op: Dict) -> None:
+        if not self._built:
+            return
+        kind = op['op']
+        if kind == 'add':
+            self._index(op['task']['id'], _text(op['task']))
+        elif kind == 'set':
+            if not any(field in op['fields'] for field in FIELDS):
+                return
+            self._unindex(op['id'])
+            task = self.store.get(op['id'])
+            if task is not None:
+                self._index(op['id'], _text(task))
+        elif kind == 'delete':
+            self._unindex(op['id'])
+        elif kind == 'renumber':
+            self._build()
+
+    # ---- queries ----
+    def _candidates(self, query: str) -> Iterable[int]:
+        """Ids that may contain query, in id order."""
+        grams = _trigrams(query)
+        if not grams:
+            return sorted(self._text)  # too short for trigrams: check every task
+        postings = []
+        for gram in grams:
+            ids = self._grams.get(gram)
+            if not ids:
+                return ()
+            postings.append(ids)
+        postings.sort(key=len)
+        found: Sequence[int] = postings[0]
+        for ids in postings[1:]:
+            found = [i for i in found if _contains(ids, i)]
+            if not found:
+                break
+        return found
+
+    def _matches(self, query: str) -> List[int]:
+        if not self._built:
+            self._build()
+        text = self._text
+        return [i for i in self._candidates(query) if query in text[i]]
+
+    def search(self, query: str, ranked: bool = False) -> List[Dict]:
+        """
+        Tasks whose title, description or category contains query
+        (case-insensitive). Unranked results are in id order, which is
+        list order because ids only ever grow (or are renumbered in order).
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        if ranked:
+            return self.best(query)[1]
+        get = self.store.get
+        return [get(i) for i in self._matches(query)]
+
+    def best(self, query: str, limit: Optional[int] = None) -> Tuple[int, List[Dict]]:
+        """
+        (number of matches, the limit best of them in ranked order); every
+        match if limit is None. Picking the best is a heap pass, not a
+        sort of every match.
+        """
+        query = query.strip().lower()
+        if not query:
+            return 0, []
+        ids = self._matches(query)
+        score, text, get = _Scorer(query), self._text, self.store.get
+        if limit is None or limit >= len(ids):
+            best = sorted(ids, key=lambda i: (-score(text[i]), sort_key(get(i))))
+            return len(ids), [get(i) for i in best]
+
+        # Ties keep view order, so sort_key is only needed inside the score
+        # tiers that make the cut: whole tiers are taken in view order, and
+        # the last one is cut by a heap or, if it holds a good share of the
+        # list, by walking the view order until enough of it has been seen
+        tiers: Dict[int, List[int]] = defaultdict(list)
+        for i in ids:
+            tiers[score(text[i])].append(i)
+        best: List[Dict] = []
+        for tier_score in sorted(tiers, reverse=True):
+            tier, wanted = tiers[tier_score], limit - len(best)
+            if len(tier) <= wanted:
+                best += sorted((get(i) for i in tier), key=sort_key)
+            elif len(tier) * 8 >= len(self.store):
+                members = set(tier)
+                for task in self.store.ordered():
+                    if task['id'] in members:
+                        best.append(task)
+                        if len(best) == limit:
+                            break
+            else:
+                best += heapq.nsmallest(wanted, (get(i) for i in tier), key=sort_key)
+            if len(best) == limit:
+                break
+        return len(ids), best
+
+    def prefix(self, prefix: str) -> List[Dict]:
+        """Tasks with a word starting with prefix, in id order."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        if not self._built:
+            self._build()
+        found: Set[int] = set()
+        vocab = self._vocab
+        for i in range(bisect_left(vocab, prefix), len(vocab)):
+            if not vocab[i].startswith(prefix):
+                break
+            found.update(self._tokens[vocab[i]])
+        return [self.store.get(i) for i in sorted(found)]
+
+    @staticmethod
+    def score(task: Dict, query: str) -> int:
+        """Relevance of task for an already lowercased query (0 = no match)."""
+        return _Scorer(query)(_text(task))
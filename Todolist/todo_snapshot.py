@@ -0,0 +1,200 @@
+"""
+Binary snapshot format for the to-do list (todo_data.bin).
+
+An alternative to todo_data.json for large lists: the file is
+memory-mapped and a task is only decoded when something asks for it, so
+opening the list costs the same however long its history is.
+
+  header     magic, version, task count, journal_seq, section offsets,
+             next unused task id
+  records    one compact JSON object per task (the todo_data.json task
+             schema, so nothing is lost), back to back
+  index      (offset, length) of each record, in list order
+  due index  (due day, priority rank, created day, id, record no,
+             completed) for every task with a due date, sorted in
+             view_tasks order
+
+"Today's tasks" is a binary search of the due index plus decoding the
+handful of records it points at. Convert an existing list with
+
+  python todo_snapshot.py todo_data.json todo_data.bin
+
+(or the other way round); pending journal entries are folded in. Once
+todo_data.bin exists the app uses it instead of todo_data.json.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from todo_model import Task, as_task, day_ordinal
+from todo_store import sort_key
+
+MAGIC = b"TODOSNAP"
+VERSION = 2
+# magic, version, task count, journal_seq, index offset, due index offset, due entries, next id
+HEADER = struct.Struct("<8sIQQQQQQ")
+HEADER_V1 = struct.Struct("<8sIQQQQQ")  # version 1 had no next id
+RECORD = struct.Struct("<QI")        # offset, length
+DUE = struct.Struct("<iBiqIB")       # due day, rank, created day, id, record no, completed
+
+
+class SnapshotError(ValueError):
+    """The file is not a readable binary snapshot."""
+
+
+def write_snapshot(path: str, tasks: Iterable, journal_seq: int = 0, next_id: int = 1) -> None:
+    """Write tasks (Task objects or dicts) to path atomically (temp file + rename)."""
+    tasks = [as_task(task) for task in tasks]
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"\0" * HEADER.size)  # filled in once the offsets are known
+        spans = []
+        offset = HEADER.size
+        for task in tasks:
+            blob = json.dumps(task.to_dict(), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            f.write(blob)
+            spans.append(RECORD.pack(offset, len(blob)))
+            offset += len(blob)
+        index_off = offset
+        f.write(b"".join(spans))
+        due = sorted((sort_key(task), recno, task.completed is True)
+                     for recno, task in enumerate(tasks) if task.due_day is not None)
+        due_off = index_off + len(spans) * RECORD.size
+        f.write(b"".join(DUE.pack(key[0], key[1], key[2], key[3], recno, done)
+                         for key, recno, done in due))
+        f.seek(0)
+        next_id = max([next_id] + [task.id + 1 for task in tasks if isinstance(task.id, int)])
+        f.write(HEADER.pack(MAGIC, VERSION, len(tasks), journal_seq, index_off, due_off, len(due), next_id))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class BinarySnapshot:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            size = st.st_size
+            if size < HEADER_V1.size:
+                raise SnapshotError(f"{path}: too short for a snapshot header")
+            self.identity = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = struct.unpack_from("<8sI", self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise SnapshotError(f"{path}: not a to-do snapshot")
+        if version == 1:
+            fields = HEADER_V1.unpack_from(self._mm, 0) + (0,)
+        elif version == VERSION and size >= HEADER.size:
+            fields = HEADER.unpack_from(self._mm, 0)
+        else:
+            self.close()
+            raise SnapshotError(f"{path}: unsupported snapshot version {version}")
+        (_magic, _version, self.count, self.journal_seq, self._index_off, self._due_off,
+         self._due_count, self.next_id) = fields
+        if (self._index_off + self.count * RECORD.size != self._due_off
+                or self._due_off + self._due_count * DUE.size != size):
+            self.close()
+            raise SnapshotError(f"{path}: truncated or damaged snapshot")
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def is_current(self) -> bool:
+        """False once the file on disk has been replaced (e.g. by another process's compaction)."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size) == self.identity
+
+    # ---- records ----
+    def raw(self, recno: int) -> Dict:
+        """Record recno as the plain dict stored in the file."""
+        offset, length = RECORD.unpack_from(self._mm, self._index_off + recno * RECORD.size)
+        return json.loads(self._mm[offset:offset + length].decode("utf-8"))
+
+    def task(self, recno: int) -> Task:
+        return Task.from_dict(self.raw(recno))
+
+    def __iter__(self) -> Iterator[Task]:
+        return (self.task(i) for i in range(self.count))
+
+    def read_all(self) -> List[Dict]:
+        return [self.raw(i) for i in range(self.count)]
+
+    # ---- due-date index ----
+    def _due_entry(self, i: int) -> Tuple:
+        return DUE.unpack_from(self._mm, self._due_off + i * DUE.size)
+
+    def _due_bisect(self, day: int) -> int:
+        """First due-index position whose due day is >= day."""
+        lo, hi = 0, self._due_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._due_entry(mid)[0] < day:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def due_between(self, start, end, open_only: bool = False) -> Iterator[Task]:
+        """Tasks with start <= due date < end, in view order, decoding only those."""
+        start, end = day_ordinal(start), day_ordinal(end)
+        for i in range(self._due_bisect(start), self._due_count):
+            due, _rank, _created, _id, recno, done = self._due_entry(i)
+            if due >= end:
+                break
+            if not (open_only and done):
+                yield self.task(recno)
+
+    def due_on(self, day, open_only: bool = False) -> Iterator[Task]:
+        day = day_ordinal(day)
+        return self.due_between(day, day + 1, open_only)
+
+
+def read_snapshot(path: str) -> Tuple[List[Dict], int, int]:
+    """(tasks as dicts, journal_seq, next_id) - what TaskJournal needs for a full load."""
+    with BinarySnapshot(path) as snap:
+        return snap.read_all(), snap.journal_seq, max(snap.next_id, 1)
+
+
+def convert(src: str, dest: str) -> int:
+    """Convert between todo_data.json and todo_data.bin, folding in the journal."""
+    from todo_journal import TaskJournal
+
+    journal = TaskJournal(src)
+    tasks = journal.load()
+    if dest.endswith(".bin"):
+        write_snapshot(dest, tasks, journal.seq, journal.next_id)
+    else:
+        tmp = dest + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"tasks": tasks, "journal_seq": journal.seq, "next_id": journal.next_id}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, dest)
+    return len(tasks)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python todo_snapshot.py SOURCE DEST   (.json <-> .bin)")
+    n = convert(sys.argv[1], sys.argv[2])
+    print(f"Wrote {n} tasks to {sys.argv[2]}")
@@ -0,0 +1,241 @@
+"""
+Indexed in-memory task store for the to-do list.
+
+Tasks are kept in a dict by id (insertion order = list order), so lookups
+are O(1), and a maintained counter hands out new ids. Secondary indexes
+hold (sort_key, id) pairs in sorted order - for all tasks, open tasks, and
+per priority and per category - so every view is a bisect plus a walk
+over the k matching tasks instead of a scan and a fresh sort of the whole
+list. sort_key orders by due date, then priority, then creation date,
+exactly like view_tasks always has, so a due-date range is a contiguous
+slice of the "all"/"open" indexes.
+
+Tasks are held as todo_model.Task records; dicts passed in are
+converted, and the index keys use the tasks' integer date ordinals.
+
+Every change is announced to subscribers as a journal-style op dict (see
+todo_journal.py), which is how the journal and other indexes stay in sync.
+"""
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from collections.abc import Sequence
+from contextlib import contextmanager
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional
+
+from todo_model import Task, as_task, day_ordinal
+
+PRIORITY_ORDER = {'High': 1, 'Medium': 2, 'Low': 3}
+NO_DAY = date.max.toordinal() + 1  # tasks without a due date sort last
+
+
+def sort_key(task: Task) -> tuple:
+    """(due day, priority rank, created day, id) - the view_tasks order."""
+    due, created = task.due_day, task.created_day
+    return (NO_DAY if due is None else due,
+            PRIORITY_ORDER.get(task.priority, 4),
+            NO_DAY if created is None else created,
+            task.id)
+
+
+def _segments(task: Task) -> List[tuple]:
+    """Names of the indexes a task belongs to."""
+    segs = [('all',), ('priority', task['priority']), ('category', task['category'])]
+    if task['completed']:
+        segs.append(('completed',))
+    else:
+        segs += [('open',), ('open-priority', task['priority']), ('open-category', task['category'])]
+    return segs
+
+
+class TaskRange(Sequence):
+    """
+    A slice of one of the store's sorted indexes, in view order. len() and
+    indexing (including page slices) are O(1) per task, so a view never has
+    to materialise the tasks it does not show. Only valid until the store
+    next changes.
+    """
+
+    __slots__ = ('_tasks', '_keys', '_start', '_stop')
+
+    def __init__(self, tasks: Dict[int, Task], keys: List[tuple], start: int, stop: int):
+        self._tasks, self._keys, self._start, self._stop = tasks, keys, start, stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._tasks[self._keys[self._start + j][-1]] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._tasks[self._keys[self._start + i][-1]]
+
+    def __iter__(self) -> Iterator[Task]:
+        tasks, keys = self._tasks, self._keys
+        for j in range(self._start, self._stop):
+            yield tasks[keys[j][-1]]
+
+
+class TaskStore:
+    def __init__(self, tasks=()):
+        self._tasks: Dict[int, Task] = {}
+        self._index: Dict[tuple, List[tuple]] = defaultdict(list)
+        self._listeners: List[Callable[[Dict], None]] = []
+        self.next_id = 1
+        self._bulk = False
+        self._stale = False  # indexes need a rebuild (changes made in bulk mode)
+        self._build(tasks)
+
+    def _build(self, tasks) -> None:
+        self._tasks = {task['id']: task for task in map(as_task, tasks)}
+        self._reindex()
+        self.next_id = max(self._tasks, default=0) + 1
+
+    def _reindex(self) -> None:
+        self._stale = False
+        self._index = defaultdict(list)
+        for task in self._tasks.values():
+            key = sort_key(task)
+            for seg in _segments(task):
+                self._index[seg].append(key)
+        for keys in self._index.values():
+            keys.sort()
+
+    @contextmanager
+    def bulk(self):
+        """
+        Apply many changes with index maintenance deferred: the sorted
+        indexes are rebuilt once (a sort) on exit instead of an insort per
+        change. A query inside the block triggers that rebuild early.
+        """
+        self._bulk = True
+        try:
+            yield self
+        finally:
+            self._bulk = False
+            if self._stale:
+                self._reindex()
+
+    # ---- change notification ----
+    def subscribe(self, listener: Callable[[Dict], None]) -> None:
+        """Call listener(op) after every change; op uses the journal format."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[Dict], None]) -> None:
+        """Stop calling a listener passed to subscribe(); unknown listeners are ignored."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, op: Dict) -> None:
+        for listener in self._listeners:
+            listener(op)
+
+    # ---- index maintenance ----
+    def _index_add(self, task: Task) -> None:
+        if self._bulk:
+            self._stale = True
+            return
+        key = sort_key(task)
+        for seg in _segments(task):
+            insort(self._index[seg], key)
+
+    def _index_remove(self, task: Task) -> None:
+        if self._bulk:
+            self._stale = True
+            return
+        key = sort_key(task)
+        for seg in _segments(task):
+            keys = self._index[seg]
+            del keys[bisect_left(keys, key)]
+            if not keys:
+                del self._index[seg]
+
+    # ---- mutations ----
+    def add(self, task: Dict) -> Task:
+        """Insert task, assigning the next id if it has none. Returns the stored Task."""
+        task = as_task(task)
+        if task.get('id') is None:
+            task['id'] = self.next_id
+        elif task['id'] in self._tasks:
+            raise ValueError(f"duplicate task id {task['id']}")
+        self.next_id = max(self.next_id, task['id'] + 1)
+        self._tasks[task['id']] = task
+        self._index_add(task)
+        self._emit({'op': 'add', 'task': task})
+        return task
+
+    def update(self, task_id: int, fields: Dict) -> Task:
+        """Change some fields of a task (not its id) and re-index it."""
+        task = self._tasks[task_id]
+        fields = {k: v for k, v in fields.items() if k != 'id' and task.get(k) != v}
+        if fields:
+            self._index_remove(task)
+            task.update(fields)
+            self._index_add(task)
+            self._emit({'op': 'set', 'id': task_id, 'fields': fields})
+        return task
+
+    def remove(self, task_id: int) -> Task:
+        task = self._tasks.pop(task_id)
+        self._index_remove(task)
+        self._emit({'op': 'delete', 'id': task_id})
+        return task
+
+    def renumber(self) -> None:
+        """Give tasks ids 1..n in list order (the old reorganize_ids behaviour)."""
+        tasks = list(self._tasks.values())
+        for i, task in enumerate(tasks, 1):
+            task['id'] = i
+        self._build(tasks)
+        self._emit({'op': 'renumber'})
+
+    # ---- lookups ----
+    def get(self, task_id: int) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        """Tasks in list (insertion) order."""
+        return iter(self._tasks.values())
+
+    def _walk(self, seg: tuple, lo: tuple = None, hi: tuple = None) -> TaskRange:
+        if self._stale:
+            self._reindex()
+        keys = self._index.get(seg, [])
+        start = bisect_left(keys, lo) if lo is not None else 0
+        stop = bisect_left(keys, hi) if hi is not None else len(keys)
+        return TaskRange(self._tasks, keys, start, stop)
+
+    def ordered(self, open_only: bool = False) -> TaskRange:
+        """Every task in view order."""
+        return self._walk(('open',) if open_only else ('all',))
+
+    def by_priority(self, priority: str, open_only: bool = False) -> TaskRange:
+        return self._walk(('open-priority' if open_only else 'priority', priority))
+
+    def by_category(self, category: str, open_only: bool = False) -> TaskRange:
+        return self._walk(('open-category' if open_only else 'category', category))
+
+    def due_between(self, start, end, open_only: bool = False) -> TaskRange:
+        """Tasks with start <= due date < end (YYYY-MM-DD strings or ordinals), in view order."""
+        return self._walk(('open',) if open_only else ('all',), (day_ordinal(start),), (day_ordinal(end),))
+
+    def due_on(self, day, open_only: bool = False) -> TaskRange:
+        day = day_ordinal(day)
+        return self.due_between(day, day + 1, open_only)
+
+    def overdue(self, today) -> TaskRange:
+        """Open tasks due before today."""
+        return self._walk(('open',), None, (day_ordinal(today),))
+
+    def completed(self) -> TaskRange:
+        return self._walk(('completed',))
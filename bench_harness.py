@@ -0,0 +1,127 @@
+"""
+Shared harness for the benchmark scripts (Mini-Expense-Tracker/bench_expenses.py,
+Todolist/bench_todo.py).
+
+A script supplies its own data generation and workloads as a
+run_size(n, args, workdir) -> results function, timing each step with
+measure(); run() does the rest: command line sizes, a scratch directory,
+run metadata, the JSON results file and the --compare report.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure(name: str, fn, results: dict, trace_memory: bool, count: int = None, unit: str = "rows"):
+    """
+    Run fn() once with stdout silenced, storing seconds (and <unit> and
+    <unit>_per_sec when count is given, peak memory when traced).
+    """
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        value = fn()
+    elapsed = time.perf_counter() - started
+    entry = {"seconds": round(elapsed, 6)}
+    if count is not None:
+        entry[unit] = count
+        entry[f"{unit}_per_sec"] = round(count / elapsed, 1) if elapsed > 0 else None
+    if trace_memory:
+        entry["peak_mib"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+    results[name] = entry
+    print(f"  {name:<28} {elapsed:>9.3f}s"
+          + (f"  {entry[f'{unit}_per_sec']:>12,.0f} {unit}/s" if count else "")
+          + (f"  peak {entry['peak_mib']:.1f} MiB" if trace_memory else ""))
+    return value
+
+
+def parse_size(text: str) -> int:
+    """'10k' / '1m' / '5000' -> int."""
+    text = text.strip().lower().replace("_", "")
+    mult = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * mult)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old: dict, new: dict, what: str = "rows") -> None:
+    """Print per-metric time ratios new/old for sizes present in both runs."""
+    print(f"\n== {old['meta']['revision']} -> {new['meta']['revision']} (time ratio, <1 is faster) ==")
+    for size, metrics in new["sizes"].items():
+        before = old["sizes"].get(size)
+        if not before:
+            continue
+        print(f"  {size} {what}")
+        for name, m in metrics.items():
+            if isinstance(m, dict) and "seconds" in m and name in before:
+                ratio = m["seconds"] / before[name]["seconds"] if before[name]["seconds"] else float("nan")
+                print(f"    {name:<28} {before[name]['seconds']:>9.3f}s -> {m['seconds']:>9.3f}s  x{ratio:.2f}")
+
+
+def add_arguments(parser: argparse.ArgumentParser, what: str, out: str) -> None:
+    """The options every benchmark takes; what names the unit of --sizes."""
+    parser.add_argument("--sizes", default="10k", help=f"comma-separated {what} counts, e.g. 10k,100k,1m")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--memory", action="store_true",
+                        help="trace peak Python memory per step (slows every step down)")
+    parser.add_argument("--workdir", help="keep generated files here instead of a temp dir")
+    parser.add_argument("--out", default=out)
+    parser.add_argument("--compare", metavar="OLD_JSON", help="print ratios against an earlier run")
+
+
+def run(args, meta: Dict, run_size: Callable[[int, object, str], dict], what: str = "rows") -> int:
+    """
+    Call run_size(n, args, workdir) for each of args.sizes and write the
+    results, with meta added to the run metadata, to args.out.
+    """
+    result = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            **meta,
+            "memory_traced": args.memory,
+        },
+        "sizes": {},
+    }
+    with contextlib.ExitStack() as stack:
+        workdir = args.workdir or stack.enter_context(tempfile.TemporaryDirectory())
+        os.makedirs(workdir, exist_ok=True)
+        for size in args.sizes.split(","):
+            n = parse_size(size)
+            result["sizes"][str(n)] = run_size(n, args, workdir)
+
+    if sys.platform != "win32":
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result["meta"]["max_rss_mib"] = round(rss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {args.out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), result, what)
+    return 0
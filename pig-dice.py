@@ -6,17 +6,42 @@
 #   If you roll a 1, you lose. If you roll any other number, it is
 #   added to your current score.
 #
+#   Before every move the best one is shown as a hint (roll or hold, as
+#   in a race to 100 points), looked up in the table pig_solver.py saves.
+#   The table is opened when the game starts; if there is none yet it is
+#   solved then (a few seconds, once - or ahead of time with
+#   "python pig_solver.py") if NumPy is installed, and without one no
+#   hint is shown.
+#
+#   Every round starts from nothing. With --carry the points you bank
+#   add up from round to round instead, and the hints take them into
+#   account:
+#
+#     python pig-dice.py
+#     python pig-dice.py --carry
+#
+#   The rules themselves live in pig_engine.py; this file supplies the
+#   decisions (get_roll_or_hold, play_again) and the messages.
+#
+
+import argparse
+import os
+
+import pig_engine
 
-import random
+policy = None          # the solved table, opened by get_policy()
+policy_loaded = False
 
 #
 #   This function will repeatedly ask you if you want to roll the die
 #   or hold (keep your current total). If you enter 'r' or 'R', it will
 #   return 'r' (for roll); if you enter 'h' or 'H', it will return 'h' (for
 #   hold). If you enter any other string, the function gives an error message
-#   and asks you for input again. 
+#   and asks you for input again. The game engine passes in the scores,
+#   which are used for the hint.
 
-def get_roll_or_hold():
+def get_roll_or_hold(score=0, opponent=0, turn_total=0, rolls=0):
+    show_hint(score, turn_total)
     valid = False
     while not valid:
         answer = input('R)oll or H)old? ')
@@ -45,35 +70,62 @@ def play_again():
             print('Please enter Y for yes or N for no')
     return answer
 
-playing = True
-print('Welcome to the game of "pig."')
-      
-while playing:
-    total = 0
-    rolling = True
-    while rolling:
-        response = get_roll_or_hold()
-        if response == 'R' or response == 'r':
-            die = random.randrange(1, 7)
-            print("You rolled a", die)
-            if die is 1:
-                print("Sorry, you lost this round")
-                rolling = False
-            else:
-                total += die
-                print("Your total is now", total)
-        else:
-            rolling = False
+#   Open the solved table the first time it is needed, solving it first
+#   (and saying so) if it has not been saved yet. Returns None if there
+#   is no table and it cannot be solved here.
 
+def get_policy():
+    global policy, policy_loaded
+    if not policy_loaded:
+        policy_loaded = True
+        try:
+            from pig_solver import default_path, load_policy
+            if not os.path.exists(default_path(pig_engine.GOAL)):
+                print("Working out the best moves for the hints (only the first time, a few seconds)...",
+                      flush=True)
+            policy = load_policy(pig_engine.GOAL)
+        except (ImportError, RuntimeError, OSError):
+            policy = None
+    return policy
 
-    if response == 'h' or response == 'H':
-        print("Your total for this round is", total)
+#   Print the move the solved policy recommends. The policy is for a
+#   race against an opponent; there is none here, so it is asked as if
+#   the opponent had not scored yet, and only the move is shown (its win
+#   chance would mean nothing in this game).
 
+def show_hint(score, total):
+    policy = get_policy()
+    if policy is None or score >= policy.goal:
+        return
+    print("Hint:", 'roll' if policy.should_roll(score, 0, total) else 'hold')
 
-    print() # for spacing
-    playing = play_again()  # will set playing to True or False
-    print(f"playing is {playing}")
+#   What the engine reports back: each roll, and the end of each round.
 
-print('Thanks for playing the game.')
+def show_roll(die, total):
+    print("You rolled a", die)
+    if die == 1:
+        print("Sorry, you lost this round")
+    else:
+        print("Your total is now", total)
 
+def show_round(points, busted, score):
+    if not busted:
+        print("Your total for this round is", points)
+    print() # for spacing
+
+def show_carried_round(points, busted, score):
+    if not busted:
+        print("Your total for this round is", points)
+        print("Your score is now", score)
+    print() # for spacing
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='The game of "pig"')
+    parser.add_argument("--carry", action="store_true",
+                        help="add up the points banked in each round instead of starting every round from 0")
+    args = parser.parse_args()
+    print('Welcome to the game of "pig."')
+    get_policy()  # before the first prompt, so it never stalls mid-game
+    pig_engine.play_rounds(get_roll_or_hold, play_again, on_roll=show_roll,
+                           on_round=show_carried_round if args.carry else show_round, carry=args.carry)
+    print('Thanks for playing the game.')
@@ -0,0 +1,107 @@
+#
+#   The rules of "pig", without input() or print
+#
+#   Every decision is a callable, so the same game can be played by a
+#   person at the keyboard (pig-dice.py) or by strategies against each
+#   other (pig_tournament.py):
+#
+#     decide(score, opponent, turn_total, rolls) -> 'r' to roll, anything else holds
+#     play_again() -> true to play another round
+#
+#   score and opponent are the points banked so far, turn_total what
+#   this turn has collected and rolls how many times it has rolled. The
+#   dice come from a roll() callable too, so a seeded random.Random
+#   makes a game repeatable.
+#
+#   Strategies by name, for the command line and for pool workers (which
+#   cannot be handed a closure):
+#
+#     holdN     roll until the turn total is at least N
+#     rollK     roll K times per turn
+#     optimal   the solved policy of pig_solver.py (for the game's goal)
+#
+
+import random
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from pig_sim import parse_policy
+
+GOAL = 100
+
+Decide = Callable[[int, int, int, int], str]
+
+
+def die_roller(rng: random.Random = None) -> Callable[[], int]:
+    """A roll() for the engine: 1-6 from rng (a new unseeded Random by default)."""
+    uniform = (rng or random.Random()).random
+    return lambda: int(uniform() * 6) + 1
+
+
+def play_turn(decide: Decide, score: int = 0, opponent: int = 0, roll: Callable[[], int] = None,
+              goal: Optional[int] = None, on_roll: Callable[[int, int], None] = None) -> Tuple[int, bool]:
+    """
+    One turn: (points banked, whether a 1 ended it). With a goal the
+    turn ends by itself once score + turn total reaches it. on_roll is
+    called with each die and the turn total after it.
+    """
+    roll = roll or die_roller()
+    total = rolls = 0
+    while goal is None or score + total < goal:
+        if decide(score, opponent, total, rolls) not in ('r', 'R'):
+            break
+        die = roll()
+        rolls += 1
+        if die == 1:
+            if on_roll:
+                on_roll(die, 0)
+            return 0, True
+        total += die
+        if on_roll:
+            on_roll(die, total)
+    return total, False
+
+
+def play_rounds(decide: Decide, play_again: Callable[[], bool], roll: Callable[[], int] = None,
+                on_roll: Callable[[int, int], None] = None,
+                on_round: Callable[[int, bool, int], None] = None, carry: bool = False) -> int:
+    """
+    Solitaire pig as pig-dice.py plays it: turns until play_again() says
+    stop. Every round starts from nothing unless carry is true, in which
+    case the banked points add up. on_round gets (points, busted, score)
+    after each turn. Returns the final score.
+    """
+    score = 0
+    while True:
+        points, busted = play_turn(decide, score, 0, roll, on_roll=on_roll)
+        score = score + points if carry else points
+        if on_round:
+            on_round(points, busted, score)
+        if not play_again():
+            return score
+
+
+def play_game(players: Sequence[Decide], goal: int = GOAL, roll: Callable[[], int] = None,
+              first: int = 0) -> Tuple[int, List[int]]:
+    """Players take turns (players[first] starts) until one reaches goal: (winner, scores)."""
+    roll = roll or die_roller()
+    scores = [0] * len(players)
+    player = first
+    while True:
+        # The opponent is the leader among the others (the only one in a two-player game)
+        if len(scores) == 2:
+            opponent = scores[1 - player]
+        else:
+            opponent = max((s for i, s in enumerate(scores) if i != player), default=0)
+        points, _busted = play_turn(players[player], scores[player], opponent, roll, goal)
+        scores[player] += points
+        if scores[player] >= goal:
+            return player, scores
+        player = (player + 1) % len(players)
+
+
+def strategy(name: str, goal: int = GOAL) -> Decide:
+    """The decision callable for a strategy name (see the top of this file)."""
+    if name.strip().lower() == "optimal":
+        from pig_solver import load_policy
+        return load_policy(goal).decide
+    return parse_policy(name)
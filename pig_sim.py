@@ -0,0 +1,272 @@
+#
+#   Monte Carlo statistics for single turns of "pig"
+#
+#   Same rules as pig-dice.py: each roll of the die adds to the turn
+#   total, rolling a 1 loses the whole turn total, holding banks it.
+#   This plays millions of turns without prompts for a fixed policy and
+#   reports the expected score, the chance of going bust and the score
+#   distribution.
+#
+#     HoldAt(n)     keep rolling until the turn total reaches n
+#     RollTimes(k)  roll exactly k times (unless a 1 comes first)
+#
+#   A policy is also a decision callable for pig_engine, so the same
+#   objects play whole games there.
+#
+#   With NumPy installed a whole chunk of turns is played at once on
+#   arrays of dice; without it the same rules run one turn at a time in
+#   plain Python. Turns are played chunk_size at a time, so memory stays
+#   the same however many turns are asked for, and a seed makes a run
+#   repeatable (same seed, engine and chunk size give the same numbers).
+#
+#     python pig_sim.py                              # hold at 20 and 25, roll 3/5 times
+#     python pig_sim.py hold20 roll4 --turns 10m --seed 7
+#     python pig_sim.py hold20 --turns 1m --no-numpy --distribution
+#
+
+import argparse
+import math
+import random
+import re
+import sys
+import time
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # plain-Python engine only
+    np = None
+
+DEFAULT_CHUNK = 1_000_000
+
+
+class HoldAt:
+    """Roll until the turn total is at least n, then hold."""
+
+    def __init__(self, n: int):
+        if n < 0:
+            raise ValueError("hold target must be >= 0")
+        self.n = n
+
+    def __str__(self):
+        return f"hold at {self.n}"
+
+    def __call__(self, score, opponent, turn_total, rolls) -> str:
+        """As a pig_engine decision: 'r' or 'h'."""
+        return "r" if turn_total < self.n else "h"
+
+    @property
+    def max_score(self) -> int:
+        return self.n + 5 if self.n > 0 else 0
+
+
+class RollTimes:
+    """Roll k times, then hold (a 1 on any of them ends the turn with 0)."""
+
+    def __init__(self, k: int):
+        if k < 0:
+            raise ValueError("number of rolls must be >= 0")
+        self.k = k
+
+    def __str__(self):
+        return f"roll {self.k} times"
+
+    def __call__(self, score, opponent, turn_total, rolls) -> str:
+        """As a pig_engine decision: 'r' or 'h'."""
+        return "r" if rolls < self.k else "h"
+
+    @property
+    def max_score(self) -> int:
+        return 6 * self.k
+
+
+def parse_policy(text: str):
+    """'hold20' / 'hold:20' -> HoldAt(20), 'roll3' / 'roll:3' -> RollTimes(3)."""
+    match = re.fullmatch(r"(hold|roll):?(\d+)", text.strip().lower())
+    if not match:
+        raise ValueError(f"bad policy {text!r}; use holdN or rollK")
+    kind, number = match.groups()
+    return HoldAt(int(number)) if kind == "hold" else RollTimes(int(number))
+
+
+class SimResult:
+    """Counts for simulated turns of one policy; chunks are added together."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.turns = 0
+        self.busts = 0
+        self.rolls = 0
+        self.counts = [0] * (policy.max_score + 1)  # counts[s]: turns that banked s
+
+    def add(self, counts, busts: int, rolls: int) -> None:
+        for score, n in enumerate(counts):
+            self.counts[score] += int(n)
+        self.turns += int(sum(counts))
+        self.busts += int(busts)
+        self.rolls += int(rolls)
+
+    @property
+    def mean(self) -> float:
+        """Expected points banked per turn."""
+        if not self.turns:
+            return 0.0
+        return sum(score * n for score, n in enumerate(self.counts)) / self.turns
+
+    @property
+    def stdev(self) -> float:
+        if self.turns < 2:
+            return 0.0
+        mean = self.mean
+        square = sum((score - mean) ** 2 * n for score, n in enumerate(self.counts))
+        return math.sqrt(square / (self.turns - 1))
+
+    @property
+    def stderr(self) -> float:
+        return self.stdev / math.sqrt(self.turns) if self.turns else 0.0
+
+    @property
+    def bust_rate(self) -> float:
+        return self.busts / self.turns if self.turns else 0.0
+
+    def percentile(self, pct: float) -> int:
+        rank = math.ceil(self.turns * pct / 100)
+        seen = 0
+        for score, n in enumerate(self.counts):
+            seen += n
+            if seen >= max(rank, 1):
+                return score
+        return len(self.counts) - 1
+
+    def distribution(self) -> Dict[int, float]:
+        """Share of turns ending with each score that occurred."""
+        return {score: n / self.turns for score, n in enumerate(self.counts) if n}
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "policy": str(self.policy),
+            "turns": self.turns,
+            "mean": round(self.mean, 4),
+            "stderr": round(self.stderr, 4),
+            "bust_rate": round(self.bust_rate, 5),
+            "rolls_per_turn": round(self.rolls / self.turns, 3) if self.turns else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+        }
+
+
+# ---- NumPy engine: a chunk of turns per call ----
+def _hold_chunk_np(rng, n: int, size: int, max_score: int):
+    totals = np.zeros(size, dtype=np.int64)
+    live = np.arange(size) if n > 0 else np.arange(0)
+    busts = rolls = 0
+    # Every live turn rolls once per pass; the ones that bust or reach n drop out
+    while live.size:
+        dice = rng.integers(1, 7, size=live.size)
+        rolls += live.size
+        ones = dice == 1
+        busts += int(ones.sum())
+        running = totals[live] + dice
+        totals[live] = np.where(ones, 0, running)
+        live = live[~ones & (running < n)]
+    return np.bincount(totals, minlength=max_score + 1), busts, rolls
+
+
+def _roll_chunk_np(rng, k: int, size: int, max_score: int):
+    if k == 0:
+        return np.bincount(np.zeros(size, dtype=np.int64), minlength=1), 0, 0
+    dice = rng.integers(1, 7, size=(size, k), dtype=np.int8)
+    ones = dice == 1
+    bust = ones.any(axis=1)
+    scores = np.where(bust, 0, dice.sum(axis=1, dtype=np.int64))
+    # Rolling stops at the first 1: count the rolls up to and including it
+    first_one = np.where(bust, ones.argmax(axis=1) + 1, k)
+    return np.bincount(scores, minlength=max_score + 1), int(bust.sum()), int(first_one.sum())
+
+
+# ---- plain-Python engine: one turn at a time ----
+def _chunk_py(rng, policy, size: int):
+    counts = [0] * (policy.max_score + 1)
+    busts = rolls = 0
+    roll = rng.randrange
+    holding = isinstance(policy, HoldAt)
+    for _ in range(size):
+        total = done = 0
+        while (total < policy.n) if holding else (done < policy.k):
+            die = roll(1, 7)
+            done += 1
+            if die == 1:
+                total = 0
+                busts += 1
+                break
+            total += die
+        rolls += done
+        counts[total] += 1
+    return counts, busts, rolls
+
+
+def simulate(policy, turns: int, seed: int = None, chunk_size: int = DEFAULT_CHUNK,
+             use_numpy: bool = True) -> SimResult:
+    """Play turns turns of policy, chunk_size at a time, and return the totals."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    if use_numpy and np is None:
+        use_numpy = False
+    result = SimResult(policy)
+    if use_numpy:
+        rng = np.random.default_rng(seed)
+        play = _hold_chunk_np if isinstance(policy, HoldAt) else _roll_chunk_np
+        param = policy.n if isinstance(policy, HoldAt) else policy.k
+    else:
+        rng = random.Random(seed)
+    left = turns
+    while left > 0:
+        size = min(chunk_size, left)
+        if use_numpy:
+            result.add(*play(rng, param, size, policy.max_score))
+        else:
+            result.add(*_chunk_py(rng, policy, size))
+        left -= size
+    return result
+
+
+def _count(text: str) -> int:
+    """'10m' / '500k' / '2000' -> int."""
+    text = text.strip().lower().replace("_", "")
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Monte Carlo statistics for turns of pig")
+    parser.add_argument("policies", nargs="*", default=["hold20", "hold25", "roll3", "roll5"],
+                        help="holdN (roll until N) or rollK (roll K times); default: %(default)s")
+    parser.add_argument("--turns", type=_count, default=1_000_000, help="turns per policy (e.g. 10m)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    parser.add_argument("--chunk", type=_count, default=DEFAULT_CHUNK, help="turns played at once")
+    parser.add_argument("--no-numpy", action="store_true", help="use the plain-Python engine")
+    parser.add_argument("--distribution", action="store_true", help="print every score's share")
+    args = parser.parse_args(argv)
+    try:
+        policies = [parse_policy(p) for p in args.policies]
+    except ValueError as e:
+        parser.error(str(e))
+
+    engine = "plain Python" if args.no_numpy or np is None else "NumPy"
+    print(f"{args.turns:,} turns per policy, seed {args.seed}, {engine}")
+    print(f"{'policy':<16}{'expected':>10}{'± s.e.':>9}{'bust':>9}{'rolls':>7}{'median':>8}{'p90':>6}{'turns/s':>13}")
+    for policy in policies:
+        start = time.perf_counter()
+        result = simulate(policy, args.turns, args.seed, args.chunk, not args.no_numpy)
+        elapsed = time.perf_counter() - start
+        s = result.summary()
+        print(f"{s['policy']:<16}{s['mean']:>10.3f}{s['stderr']:>9.3f}{s['bust_rate']:>9.2%}"
+              f"{s['rolls_per_turn']:>7.2f}{s['p50']:>8}{s['p90']:>6}{args.turns / elapsed:>13,.0f}")
+        if args.distribution:
+            for score, share in result.distribution().items():
+                print(f"    {score:>3}  {share:8.4%}  {'#' * round(share * 200)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
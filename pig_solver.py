@@ -0,0 +1,256 @@
+#
+#   Optimal play for two-player pig
+#
+#   The player to move has banked i points, the opponent j, and the
+#   current turn total is k. P(i, j, k) is the chance that the player to
+#   move goes on to win (first to reach the goal) when both sides play
+#   perfectly:
+#
+#     hold: 1 - P(j, i + k, 0)                 (1 if i + k reaches the goal)
+#     roll: (1 - P(j, i, 0)) / 6               (a 1: the turn total is lost)
+#           + sum of P(i, j, k + r) / 6 for r = 2..6
+#     P(i, j, k) = max(hold, roll)
+#
+#   The equations refer to each other in a cycle (my turn, your turn, my
+#   turn ...), so they are solved by value iteration: start from a guess
+#   and apply the formulas to every state at once, with NumPy, until no
+#   probability changes by more than the tolerance.
+#
+#   The result is written to pig_policy_<goal>.bin:
+#
+#     header        magic, version, goal, sweeps, tolerance, solve seconds
+#     policy        one bit per state, 1 = roll, state (i, j, k) is bit
+#                   (i * goal + j) * goal + k
+#     win chance    one uint16 per state, in the same order (P * 65535)
+#
+#   Later runs memory-map the file instead of solving again, and a move
+#   is one bit lookup. Solving needs NumPy; reading a solved table does
+#   not.
+#
+#     python pig_solver.py              # solve for 100 points (or load), print timings
+#     python pig_solver.py --goal 50 --force
+#     python pig_solver.py --show 0 0   # the roll/hold boundary for scores 0 vs 0
+#
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # a saved table can still be read
+    np = None
+
+MAGIC = b"PIGPOLCY"
+VERSION = 1
+# magic, version, goal, sweeps, tolerance, solve seconds
+HEADER = struct.Struct("<8sIIIdd")
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def default_path(goal: int) -> str:
+    return os.path.join(HERE, f"pig_policy_{goal}.bin")
+
+
+def solve(goal: int = 100, tolerance: float = 1e-9, max_sweeps: int = 10_000):
+    """
+    Value iteration; returns (roll, win, sweeps, seconds) with roll and
+    win indexed [i, j, k]. States with i + k >= goal are never played;
+    they are stored as "hold" with a win chance of 1.
+    """
+    if np is None:
+        raise RuntimeError("solving needs NumPy (pip install numpy)")
+    if goal < 1:
+        raise ValueError("goal must be >= 1")
+    start = time.perf_counter()
+    g = goal
+    i, j, k = np.meshgrid(np.arange(g), np.arange(g), np.arange(g), indexing="ij")
+    live = (i + k < g).ravel()
+    n = int(live.sum())
+    # Only states with i + k < goal are solved, as a flat vector; every
+    # state a move leads to is looked up through an index into it, where
+    # index n means "won" (value 1) and n + 1 "lost" (value 0)
+    position = np.full(g ** 3, n + 1, dtype=np.int64)
+    position[live] = np.arange(n)
+
+    def index(ii, jj, kk, won):
+        flat = position[(np.minimum(ii, g - 1) * g + np.minimum(jj, g - 1)) * g + np.minimum(kk, g - 1)]
+        return np.where(won, n, flat).ravel()[live]
+
+    # Holding banks i + k: a win, or the opponent's turn at (j, i + k, 0)
+    hold_to = index(j, i + k, 0, i + k >= g)
+    # Rolling a 1 hands the turn over at (j, i, 0); rolling r leads to (i, j, k + r)
+    bust_to = index(j, i, 0, False)
+    roll_to = np.stack([index(i, j, k + r, i + k + r >= g) for r in range(2, 7)])
+
+    p = np.zeros(n + 2)
+    p[n] = 1.0
+    for sweeps in range(1, max_sweeps + 1):
+        hold = 1.0 - p[hold_to]
+        roll = (1.0 - p[bust_to] + p[roll_to].sum(axis=0)) / 6
+        new = np.maximum(hold, roll)
+        change = float(np.abs(new - p[:n]).max())
+        p[:n] = new
+        if change < tolerance:
+            break
+    roll_best = np.zeros(g ** 3, dtype=bool)
+    roll_best[live] = roll > hold
+    win = np.ones(g ** 3)
+    win[live] = p[:n]
+    seconds = time.perf_counter() - start
+    return roll_best.reshape(g, g, g), win.reshape(g, g, g), sweeps, seconds
+
+
+def save_table(path: str, goal: int, roll, win, sweeps: int, tolerance: float, seconds: float) -> None:
+    """Write a solved table atomically (temp file + rename)."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, goal, sweeps, tolerance, seconds))
+        f.write(np.packbits(roll.ravel(), bitorder="little").tobytes())
+        f.write(np.round(np.clip(win, 0, 1).ravel() * 65535).astype("<u2").tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class PolicyTable:
+    """A solved table, memory-mapped; recommend() and win_chance() are O(1)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path}: not a pig policy table")
+        magic, version, self.goal, self.sweeps, self.tolerance, self.seconds = \
+            HEADER.unpack_from(self._mm, 0)
+        states = self.goal ** 3
+        self._bits = HEADER.size
+        self._wins = self._bits + (states + 7) // 8
+        if magic != MAGIC or version != VERSION or len(self._mm) != self._wins + 2 * states:
+            self.close()
+            raise ValueError(f"{path}: not a pig policy table for this version")
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _state(self, score: int, opponent: int, turn_total: int) -> int:
+        if not (0 <= score < self.goal and 0 <= opponent < self.goal and turn_total >= 0):
+            raise ValueError(f"scores must be between 0 and {self.goal - 1}")
+        return (score * self.goal + opponent) * self.goal + turn_total
+
+    def should_roll(self, score: int, opponent: int, turn_total: int) -> bool:
+        """Whether rolling is the optimal move (holding once the goal is reached)."""
+        if score + turn_total >= self.goal:
+            return False
+        state = self._state(score, opponent, turn_total)
+        return bool(self._mm[self._bits + (state >> 3)] >> (state & 7) & 1)
+
+    def recommend(self, score: int, opponent: int, turn_total: int) -> str:
+        """'r' to roll or 'h' to hold - the answers get_roll_or_hold takes."""
+        return "r" if self.should_roll(score, opponent, turn_total) else "h"
+
+    def decide(self, score: int, opponent: int, turn_total: int, rolls: int = 0) -> str:
+        """recommend() as a pig_engine decision, without the range checks (games call it a lot)."""
+        goal = self.goal
+        if score + turn_total >= goal:
+            return "h"
+        state = (score * goal + opponent) * goal + turn_total
+        return "r" if self._mm[self._bits + (state >> 3)] >> (state & 7) & 1 else "h"
+
+    def win_chance(self, score: int, opponent: int, turn_total: int) -> float:
+        """Chance the player to move wins with optimal play from here on."""
+        if score + turn_total >= self.goal:
+            return 1.0
+        state = self._state(score, opponent, turn_total)
+        return struct.unpack_from("<H", self._mm, self._wins + 2 * state)[0] / 65535
+
+    def hold_at(self, score: int, opponent: int) -> int:
+        """Lowest turn total at which the optimal move is to hold."""
+        for total in range(self.goal - score + 1):
+            if not self.should_roll(score, opponent, total):
+                return total
+        return self.goal - score
+
+
+def load_policy(goal: int = 100, path: str = None, force: bool = False) -> PolicyTable:
+    """The saved table for goal, solving and saving it first if there is none."""
+    path = path or default_path(goal)
+    if not force:
+        try:
+            table = PolicyTable(path)
+        except (OSError, ValueError):
+            pass
+        else:
+            if table.goal == goal:
+                return table
+            table.close()
+    roll, win, sweeps, seconds = solve(goal)
+    save_table(path, goal, roll, win, sweeps, 1e-9, seconds)
+    return PolicyTable(path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Optimal roll/hold policy for two-player pig")
+    parser.add_argument("--goal", type=int, default=100, help="points needed to win (default: 100)")
+    parser.add_argument("--file", help="policy table file (default: pig_policy_<goal>.bin here)")
+    parser.add_argument("--force", action="store_true", help="solve again even if a table exists")
+    parser.add_argument("--show", nargs=2, type=int, metavar=("SCORE", "OPPONENT"),
+                        help="print the turn total to hold at and the win chance")
+    args = parser.parse_args(argv)
+
+    # Solving and opening are timed apart, so an existing table's load time
+    # is not mistaken for the solve and vice versa
+    path = args.file or default_path(args.goal)
+    table = None
+    if not args.force:
+        start = time.perf_counter()
+        try:
+            table = PolicyTable(path)
+        except (OSError, ValueError):
+            pass
+        else:
+            if table.goal != args.goal:
+                table.close()
+                table = None
+        opened = time.perf_counter() - start
+    if table is None:
+        start = time.perf_counter()
+        try:
+            load_policy(args.goal, path, force=True).close()
+        except RuntimeError as e:
+            sys.exit(str(e))
+        print(f"Solved and saved in {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        table = PolicyTable(path)
+        opened = time.perf_counter() - start
+    with table:
+        print(f"{table.path}: goal {table.goal}, {table.goal ** 3:,} states, "
+              f"converged in {table.sweeps} sweeps ({table.seconds:.2f}s, tolerance {table.tolerance:g})")
+        print(f"Loaded in {opened * 1000:.1f} ms")
+        lookups = 100_000
+        start = time.perf_counter()
+        for n in range(lookups):
+            table.should_roll(n % table.goal, (n // 7) % table.goal, n % 13)
+        print(f"Lookup: {(time.perf_counter() - start) / lookups * 1e9:.0f} ns per move")
+        if args.show:
+            score, opponent = args.show
+            print(f"At {score} vs {opponent}: hold at a turn total of {table.hold_at(score, opponent)}, "
+                  f"win chance {table.win_chance(score, opponent, 0):.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#
+#   Round-robin tournament between pig strategies
+#
+#   Every pair of strategies plays the same number of games, taking
+#   turns to go first. The games are cut into fixed-size chunks and the
+#   chunks are played in a process pool. Each chunk gets its own random
+#   stream, seeded from (seed, pair, chunk number), so the results
+#   depend only on the seed and chunk size - not on the number of
+#   workers or the order the chunks finish in. Chunk results are merged
+#   into win rates per pair and per strategy, and the run reports
+#   games/sec. --scaling repeats the run for 1, 2, 4 ... workers to show
+#   how throughput grows with cores.
+#
+#     python pig_tournament.py                          # hold20 hold25 roll3 roll5 optimal
+#     python pig_tournament.py hold15 hold20 hold25 --games 1m --workers 8
+#     python pig_tournament.py --games 200k --scaling
+#
+
+import argparse
+import hashlib
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+import pig_engine
+from pig_sim import _count
+
+DEFAULT_STRATEGIES = ["hold20", "hold25", "roll3", "roll5", "optimal"]
+DEFAULT_CHUNK = 10_000
+
+_players: Dict[Tuple[str, int], pig_engine.Decide] = {}  # per worker process
+
+
+def chunk_seed(seed: int, a: str, b: str, chunk: int) -> int:
+    """Seed of one chunk's random stream; distinct inputs give unrelated streams."""
+    digest = hashlib.blake2b(f"{seed}:{a}:{b}:{chunk}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _player(name: str, goal: int) -> pig_engine.Decide:
+    player = _players.get((name, goal))
+    if player is None:
+        player = _players[(name, goal)] = pig_engine.strategy(name, goal)
+    return player
+
+
+def play_chunk(a: str, b: str, games: int, seed: int, goal: int = pig_engine.GOAL) -> Tuple[str, str, int, int]:
+    """Play games games of a against b (alternating who starts): (a, b, wins of a, games)."""
+    players = (_player(a, goal), _player(b, goal))
+    roll = pig_engine.die_roller(random.Random(seed))
+    wins = 0
+    for n in range(games):
+        winner, _scores = pig_engine.play_game(players, goal, roll, first=n % 2)
+        wins += winner == 0
+    return a, b, wins, games
+
+
+class Results:
+    """Games won and played per ordered pair, merged from chunks."""
+
+    def __init__(self, strategies: List[str]):
+        self.strategies = strategies
+        self.wins: Dict[Tuple[str, str], int] = {}
+        self.games: Dict[Tuple[str, str], int] = {}
+
+    def add(self, a: str, b: str, wins: int, games: int) -> None:
+        for key, won in (((a, b), wins), ((b, a), games - wins)):
+            self.wins[key] = self.wins.get(key, 0) + won
+            self.games[key] = self.games.get(key, 0) + games
+
+    @property
+    def total_games(self) -> int:
+        return sum(self.games.values()) // 2
+
+    def win_rate(self, a: str, b: str) -> float:
+        games = self.games.get((a, b), 0)
+        return self.wins[(a, b)] / games if games else float("nan")
+
+    def overall(self, a: str) -> float:
+        won = sum(w for (x, _), w in self.wins.items() if x == a)
+        games = sum(g for (x, _), g in self.games.items() if x == a)
+        return won / games if games else float("nan")
+
+    def table(self) -> str:
+        width = max(9, max(len(s) for s in self.strategies) + 2)
+        lines = ["".ljust(width) + "".join(s.rjust(width) for s in self.strategies) + "overall".rjust(width)]
+        for a in sorted(self.strategies, key=self.overall, reverse=True):
+            cells = ["-".rjust(width) if a == b else f"{self.win_rate(a, b):.2%}".rjust(width)
+                     for b in self.strategies]
+            lines.append(a.ljust(width) + "".join(cells) + f"{self.overall(a):.2%}".rjust(width))
+        return "\n".join(lines)
+
+
+def run(strategies: List[str], games: int, seed: int = 0, workers: int = None,
+        chunk_size: int = DEFAULT_CHUNK, goal: int = pig_engine.GOAL) -> Tuple[Results, float]:
+    """Play the round robin; returns (results, seconds)."""
+    strategies = list(dict.fromkeys(name.strip().lower() for name in strategies))
+    if "optimal" in strategies:
+        pig_engine.strategy("optimal", goal)  # solve (once) here, not in every worker
+    jobs = []
+    for a, b in itertools.combinations(strategies, 2):
+        for chunk, start in enumerate(range(0, games, chunk_size)):
+            jobs.append((a, b, min(chunk_size, games - start), chunk_seed(seed, a, b, chunk), goal))
+    results = Results(strategies)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_chunk, *job) for job in jobs]
+        for fut in as_completed(futures):
+            results.add(*fut.result())
+    return results, time.perf_counter() - started
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Round-robin tournament between pig strategies")
+    parser.add_argument("strategies", nargs="*", default=DEFAULT_STRATEGIES,
+                        help="holdN, rollK or optimal; default: %(default)s")
+    parser.add_argument("--games", type=_count, default=_count("20k"), help="games per pair (e.g. 1m)")
+    parser.add_argument("--goal", type=int, default=pig_engine.GOAL, help="points to win (default: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--chunk", type=_count, default=DEFAULT_CHUNK, help="games per pool task")
+    parser.add_argument("--scaling", action="store_true",
+                        help="run with 1, 2, 4 ... up to --workers processes and compare games/sec")
+    args = parser.parse_args(argv)
+    # Names as strategy() reads them, so "Optimal" is solved here once too
+    strategies = list(dict.fromkeys(name.strip().lower() for name in args.strategies))
+    if len(strategies) < 2:
+        parser.error("need at least two different strategies")
+    try:
+        for name in strategies:
+            pig_engine.strategy(name, args.goal)  # "optimal" loads (or solves) its table now
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+
+    counts = [args.workers]
+    if args.scaling:
+        counts = sorted({min(2 ** p, args.workers) for p in range(args.workers.bit_length() + 1)})
+    baseline = None
+    for workers in counts:
+        results, seconds = run(strategies, args.games, args.seed, workers, args.chunk, args.goal)
+        rate = results.total_games / seconds
+        baseline = baseline or rate
+        print(f"{workers:>3} worker(s): {results.total_games:,} games in {seconds:.2f}s - "
+              f"{rate:,.0f} games/sec ({rate / baseline:.2f}x)")
+    print(f"\nWin rate of the row strategy against the column strategy (goal {args.goal}, seed {args.seed}):")
+    print(results.table())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())